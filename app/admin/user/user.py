@@ -16,6 +16,10 @@ from app.config import utils
 
 from app.config.created_image import generate_image_with_letter
 from app.auth import oauth2
+from app.cache.principals import principal_cache
+from app.cache.room_meta import room_meta_cache
+from app.settings.get_info import get_room_hell_id
+from app.settings.passwords import password_service
 from app.database.async_db import get_async_session
 
 from app.models import user_model, room_model
@@ -112,7 +116,7 @@ async def created_user_admin(email: EmailStr = Form(...),
                             detail=f"User with user_name {existing_username_user.user_name} already exists")
     
     # Hash the user's password
-    hashed_password = utils.hash(user_data.password)
+    hashed_password = await password_service.hash(user_data.password)
     user_data.password = hashed_password
     
     verification_token = utils.generate_unique_token(user_data.email)
@@ -133,7 +137,8 @@ async def created_user_admin(email: EmailStr = Form(...),
     await db.refresh(new_user)
     
     # Create a User_Status entry for the new user
-    post = user_model.UserStatus(user_id=new_user.id, user_name=new_user.user_name, name_room="Hell", room_id=1)
+    post = user_model.UserStatus(user_id=new_user.id, user_name=new_user.user_name,
+                                 room_id=await get_room_hell_id(db))
     db.add(post)
     await db.commit()
     await db.refresh(post)
@@ -168,12 +173,14 @@ async def activated_deactivated_user(user_id: UUID,
         if user.active:
             user.active = False
             await db.commit()
+            await principal_cache.invalidate(user.id)
             await db.refresh(user)
             return {f"User {user.user_name}": "Deactivated"}
             
         else:
             user.active = True
             await db.commit()
+            await principal_cache.invalidate(user.id)
             await db.refresh(user)
             return {f"User {user.user_name}": "Activated"}
     except Exception as e:
@@ -246,13 +253,17 @@ async def deactivation_user(user_id: UUID,
                 company_id=existing_user.company_id
             )
         db.add(deactivation)
+        reassigned_rooms = [room.id for room in rooms_to_update]
         
         await db.commit()
+        for room_id in reassigned_rooms:
+            await room_meta_cache.invalidate(room_id)
 
         
         # delete user
         await db.delete(existing_user)
         await db.commit()
+        await principal_cache.invalidate(user_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,65 +1,38 @@
-<<<<<<< HEAD
-=======
 from _log_config.log_config import get_logger
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
 from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import select
-<<<<<<< HEAD
-=======
+from typing import Tuple
 from uuid import UUID
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
+from app.auth.principal import Principal
+from app.cache.principals import principal_cache
 from app.database import async_db
 from app.models import user_model
-from app.schemas.token import TokenData
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config.config import settings
 
-<<<<<<< HEAD
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
-
-=======
 oauth2_logger = get_logger('oauth2', 'oauth2log.log')
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
 
-<<<<<<< HEAD
-async def create_access_token(data: dict, db: AsyncSession):
-    user_id = data.get("user_id")
-    user = await db.execute(select(user_model.User).filter(user_model.User.id == user_id))
-    user = user.scalar()
-
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = data.copy()
-    to_encode.update({
-        "exp": expire,
-        "password_changed": str(user.password_changed)
-    })
-
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-=======
-async def create_access_token(user_id: UUID, db: AsyncSession):
+def create_access_token(user: user_model.User) -> str:
+    """Access token for an already loaded user; carries its company and ``password_changed`` stamp."""
     try:
-        user = await db.execute(select(user_model.User).where(user_model.User.id == user_id))
-        user = user.scalar_one_or_none()
-
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
         to_encode = {
             "exp": int(expire.timestamp()),  # Convert datetime to string
-            "user_id": str(user_id),  # Ensure UUID is converted to string
+            "user_id": str(user.id),  # Ensure UUID is converted to string
             "company": str(user.company_id),
             "password_changed": str(user.password_changed)
         }
@@ -70,61 +43,137 @@ async def create_access_token(user_id: UUID, db: AsyncSession):
         oauth2_logger.error(f"Error creating access token: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail="Error creating access token")
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
 
-
-async def verify_access_token(token: str, credentials_exception, db: AsyncSession):
+def create_refresh_token(user: user_model.User) -> str:
+    """Refresh token for an already loaded user, valid for ten days."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-<<<<<<< HEAD
-        user_id: str = payload.get("user_id")
-        if user_id is None:
-            raise credentials_exception
+        expire = datetime.now(timezone.utc) + timedelta(days=10)
+        to_encode = {
+            "exp": int(expire.timestamp()),
+            "user_id": str(user.id),
+            "last_password_change": str(user.password_changed)
+        }
 
-        user = await db.execute(select(user_model.User).filter(user_model.User.id == user_id))
-        user = user.scalar()
+        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        return encoded_jwt
+    except Exception as e:
+        oauth2_logger.error(f"Error creating refresh token: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail="Error creating refresh token")
 
-        if user is None or str(user.password_changed) != payload['password_changed']:
-            raise credentials_exception 
 
-        token_data = TokenData(id=user_id)
-    except JWTError:
-        raise credentials_exception
+def issue_token_pair(user: user_model.User) -> Tuple[str, str]:
+    """``(access_token, refresh_token)`` for a user the caller has already loaded and checked."""
+    return create_access_token(user), create_refresh_token(user)
 
-    return token_data
 
-    
-=======
+def decode_access_token(token: str, credentials_exception) -> Tuple[UUID, UUID, str]:
+    """
+    Returns ``(user_id, company_id, password_changed)`` from a valid access token.
+
+    Raises:
+        HTTPException: ``credentials_exception`` if the token is invalid or expired.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id_str: str = payload.get("user_id")
         company_id_str: str = payload.get("company")
+        password_changed: str = payload.get("password_changed")
 
-        if user_id_str is None or company_id_str is None:
+        if user_id_str is None or company_id_str is None or password_changed is None:
             raise credentials_exception
 
-        user_id = UUID(user_id_str)
-        company_id = UUID(company_id_str)
-        user = await db.execute(select(user_model.User).where(user_model.User.id == user_id,
-                                                               user_model.User.company_id == company_id))
-        user = user.scalar_one_or_none()
+        return UUID(user_id_str), UUID(company_id_str), password_changed
+    except HTTPException:
+        raise
+    except JWTError:
+        oauth2_logger.error(f"Invalid JWT token: {token}")
+        raise credentials_exception
+    except Exception as e:
+        oauth2_logger.error(f"Error decoding access token: {e}")
+        raise credentials_exception
+
+
+async def verify_access_token(token: str, credentials_exception, db: AsyncSession) -> user_model.User:
+    """
+    Checks an access token and returns its user, attached to ``db``.
+
+    The user comes from ``principal_cache`` when it holds them with the token's
+    ``password_changed`` stamp; otherwise it is loaded with one query and cached.
 
-        if user is None or str(user.password_changed) != payload['password_changed']:
+    Raises:
+        HTTPException: ``credentials_exception`` if the token is invalid, its user is gone
+            or has moved company, or the password changed after it was issued.
+    """
+    user_id, company_id, password_changed = decode_access_token(token, credentials_exception)
+    try:
+        user = await principal_cache.get(user_id, password_changed)
+        if user is not None:
+            user = await db.merge(user, load=False)
+        else:
+            user = await db.execute(select(user_model.User).where(user_model.User.id == user_id))
+            user = user.scalar_one_or_none()
+
+            if user is None or str(user.password_changed) != password_changed:
+                raise credentials_exception
+            await principal_cache.set(user)
+
+        if user.company_id != company_id:
             raise credentials_exception
 
-        token_data = TokenData(id=user_id)
-        return token_data
+        return user
 
-    except JWTError:
-        oauth2_logger.error(f"Invalid JWT token: {token}")
+    except HTTPException:
+        raise
     except Exception as e:
         oauth2_logger.error(f"Error verifying access token: {e}")
 
         raise credentials_exception
 
 
+async def verify_access_principal(token: str, credentials_exception, db: AsyncSession) -> Principal:
+    """
+    Like ``verify_access_token``, but returns a ``Principal``. A cache miss selects only the
+    columns a principal needs and nothing is added to the session.
+    """
+    user_id, company_id, password_changed = decode_access_token(token, credentials_exception)
+    try:
+        principal = await principal_cache.get_principal(user_id, password_changed)
+        if principal is None:
+            row = await db.execute(
+                select(user_model.User.id, user_model.User.company_id, user_model.User.role,
+                       user_model.User.blocked, user_model.User.verified, user_model.User.active,
+                       user_model.User.password_changed)
+                .where(user_model.User.id == user_id)
+            )
+            row = row.one_or_none()
+
+            if row is None or str(row.password_changed) != password_changed:
+                raise credentials_exception
+            principal = Principal.from_user(row)
+            await principal_cache.set_principal(principal, password_changed)
+
+        if principal.company_id != company_id:
+            raise credentials_exception
+
+        return principal
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        oauth2_logger.error(f"Error verifying access token: {e}")
+        raise credentials_exception
+
+
+def credentials_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"}
+    )
 
 
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 async def get_current_user(token: str = Depends(oauth2_scheme),
                            db: AsyncSession = Depends(async_db.get_async_session)):
     """
@@ -140,78 +189,30 @@ async def get_current_user(token: str = Depends(oauth2_scheme),
     Raises:
         HTTPException: If the credentials are invalid.
     """
-    credentials_exception = HTTPException(
-<<<<<<< HEAD
-        status_code=status.HTTP_401_UNAUTHORIZED, 
-        detail="Could not validate credentials", 
-        headers={"WWW-Authenticate": "Bearer"}
-        )
-    
-    token = await verify_access_token(token, credentials_exception, db)
-    
-    
-    user = await db.execute(select(user_model.User).filter(user_model.User.id == token.id))
-    user = user.scalar()
-    
-    return user
-
-
-async def create_refresh_token(user_id: int, db: AsyncSession):
-    # Отримання користувача з бази даних
-    user = await db.execute(select(user_model.User).filter(user_model.User.id == user_id))
-    user = user.scalar()
-
-    if not user:
-        raise Exception("User not found")  # Помилка, якщо користувач не знайдений
-
-    expire = datetime.now(timezone.utc) + timedelta(days=100)
-    to_encode = {
-        "exp": expire,
-        "user_id": user_id,
-        "last_password_change": str(user.password_changed)
-    }
-
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-=======
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"}
-    )
     try:
-        token = await verify_access_token(token, credentials_exception, db)
-
-        user = await db.execute(select(user_model.User).where(user_model.User.id == token.id))
-        user = user.scalar_one_or_none()
-        if not user:
-            oauth2_logger.error("Could not find user")
-
-        return user
+        return await verify_access_token(token, credentials_error(), db)
+    except HTTPException:
+        raise
     except Exception as e:
         oauth2_logger.error(f"Error getting current user: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail="Error getting current user")
 
 
-async def create_refresh_token(user_id: UUID, db: AsyncSession):
-    try:# Отримання користувача з бази даних
-        user = await db.execute(select(user_model.User).filter(user_model.User.id == user_id))
-        user = user.scalar()
-
-        if not user:
-            raise Exception("User not found")  # Помилка, якщо користувач не знайдений
-
-        expire = datetime.now(timezone.utc) + timedelta(days=10)
-        to_encode = {
-            "exp": int(expire.timestamp()),
-            "user_id": str(user_id),
-            "last_password_change":str(user.password_changed)
-        }
+async def get_current_principal(token: str = Depends(oauth2_scheme),
+                                db: AsyncSession = Depends(async_db.get_async_session)) -> Principal:
+    """
+    Get the id, company, role and status flags of the authenticated user, for routes that
+    don't need the ``User`` row. Use ``get_current_user`` to change the user.
 
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        return encoded_jwt
+    Raises:
+        HTTPException: If the credentials are invalid.
+    """
+    try:
+        return await verify_access_principal(token, credentials_error(), db)
+    except HTTPException:
+        raise
     except Exception as e:
-        oauth2_logger.error(f"Error creating refresh token: {e}")
+        oauth2_logger.error(f"Error getting current principal: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            detail="Error creating refresh token")
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
+                            detail="Error getting current user")
@@ -0,0 +1,46 @@
+"""
+The authenticated caller as seen by routes that don't need the ``User`` row.
+
+``oauth2.get_current_principal`` returns a ``Principal``: the ids from the verified token
+plus the user's role and status flags, read from ``principal_cache`` or from one narrow
+query. It is immutable and not attached to any session, so routes that only check who
+the caller is and whether they are blocked skip loading and tracking an ORM object.
+Routes that change the user keep using ``oauth2.get_current_user``.
+"""
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+# Bits of ``Principal.status``
+BLOCKED = 1
+VERIFIED = 2
+ACTIVE = 4
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: UUID
+    company_id: Optional[UUID]
+    role: str
+    status: int
+
+    @property
+    def blocked(self) -> bool:
+        return bool(self.status & BLOCKED)
+
+    @property
+    def verified(self) -> bool:
+        return bool(self.status & VERIFIED)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.status & ACTIVE)
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """From a ``User`` or a row with its ``id``, ``company_id``, ``role``, ``blocked``, ``verified`` and ``active``."""
+        status = ((BLOCKED if user.blocked else 0)
+                  | (VERIFIED if user.verified else 0)
+                  | (ACTIVE if user.active else 0))
+        role = getattr(user.role, "value", user.role)
+        return cls(id=user.id, company_id=user.company_id, role=role, status=status)
@@ -0,0 +1,143 @@
+"""
+Key/value stores shared by the in-process caches.
+
+``InMemoryBackend`` keeps values in the worker's memory and is what tests use;
+``RedisBackend`` shares them between workers through ``settings.redis_url``.
+Both store JSON-compatible values with a per-key TTL in seconds.
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from _log_config.log_config import get_logger
+from app.config.config import settings
+
+cache_logger = get_logger('cache', 'cache.log')
+
+
+class InMemoryBackend:
+    """
+    Bounded LRU of values with an expiry time per key.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Entries held, including expired ones not yet evicted."""
+        return len(self._data)
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    async def clear(self):
+        self._data.clear()
+
+
+class RedisBackend:
+    """
+    Redis store. Connection errors are logged and treated as cache misses, so an
+    unavailable Redis slows requests down instead of failing them.
+    """
+
+    def __init__(self, url: str = None, prefix: str = "company_api:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self.client = redis.from_url(url or f"redis://{settings.redis_url}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception as e:
+            cache_logger.warning(f"Redis get {key} failed: {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int):
+        try:
+            await self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+        except Exception as e:
+            cache_logger.warning(f"Redis set {key} failed: {e}")
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as e:
+            cache_logger.warning(f"Redis delete {key} failed: {e}")
+
+    async def clear(self):
+        try:
+            async for key in self.client.scan_iter(match=self.prefix + "*"):
+                await self.client.delete(key)
+        except Exception as e:
+            cache_logger.warning(f"Redis clear failed: {e}")
+
+
+class KeyedCache:
+    """
+    Values of one kind kept under ``"{prefix}:{id}"`` for ``ttl`` seconds, with the hit/miss
+    counters ``cache_stats`` reports. Subclasses set ``prefix`` and load and build the values.
+    """
+    prefix = ""
+
+    def __init__(self, ttl: int, backend: InMemoryBackend):
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def key(cls, item_id) -> str:
+        return f"{cls.prefix}:{item_id}"
+
+    async def lookup(self, key: str, valid=None) -> Optional[Any]:
+        """The value under ``key``; a missing value, or one ``valid`` rejects, counts as a miss and gives ``None``."""
+        value = await self.backend.get(key)
+        if value is None or (valid is not None and not valid(value)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def store(self, key: str, value: Any):
+        await self.backend.set(key, value, self.ttl)
+
+    async def invalidate(self, item_id):
+        if item_id is None:
+            return
+        await self.backend.delete(self.key(item_id))
+
+    async def clear(self):
+        await self.backend.clear()
+
+
+def cache_stats(cache) -> dict:
+    """Hit/miss counters of one of the caches, plus the entries held in its in-process tier."""
+    lookups = cache.hits + cache.misses
+    local = cache.local if hasattr(cache, "local") else cache.backend
+    return {
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "hit_rate": round(cache.hits / lookups, 4) if lookups else 0.0,
+        "entries": len(local) if isinstance(local, InMemoryBackend) else None,
+    }
@@ -0,0 +1,68 @@
+"""
+Authenticated users keyed by user id, for ``oauth2.get_current_user`` and ``get_current_principal``.
+
+Every authenticated request needs the user behind its token. An entry keeps a detached
+copy of the ``User`` row together with the ``password_changed`` stamp it was loaded with;
+a token carrying a different stamp misses, so tokens issued before a password change are
+checked against the database and rejected. ``oauth2`` merges the copy into the request's
+session without loading it, so endpoints can still change and commit ``current_user``.
+Routes that only need the caller's ids, role and flags get a ``Principal`` instead, cached
+under its own key with the same stamp.
+
+Entries expire after ``settings.principal_cache_ttl`` seconds. Endpoints that change what
+a user may do (password, block, verification, deactivation, deletion, profile) call
+``invalidate`` after committing; changes made elsewhere show up within the TTL.
+"""
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.auth.principal import Principal
+from app.cache.backends import InMemoryBackend, KeyedCache
+from app.config.config import settings
+from app.models import user_model
+
+
+def detached_copy(user: user_model.User) -> user_model.User:
+    """A session-less copy of ``user``'s columns that ``Session.merge(load=False)`` accepts."""
+    copy = user_model.User(**{attr.key: getattr(user, attr.key)
+                              for attr in inspect(user_model.User).column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+
+class PrincipalCache(KeyedCache):
+    prefix = "principal"
+
+    @staticmethod
+    def status_key(user_id) -> str:
+        return f"principal_status:{user_id}"
+
+    async def get(self, user_id: UUID, password_changed: str) -> Optional[user_model.User]:
+        """The cached user, if there is one loaded with the same ``password_changed`` stamp as the token."""
+        entry = await self.lookup(self.key(user_id), valid=lambda entry: entry[0] == password_changed)
+        return entry[1] if entry is not None else None
+
+    async def set(self, user: user_model.User):
+        await self.store(self.key(user.id), (str(user.password_changed), detached_copy(user)))
+        await self.set_principal(Principal.from_user(user), str(user.password_changed))
+
+    async def get_principal(self, user_id: UUID, password_changed: str) -> Optional[Principal]:
+        """Like ``get``, for the caller's ``Principal``."""
+        entry = await self.lookup(self.status_key(user_id), valid=lambda entry: entry[0] == password_changed)
+        return entry[1] if entry is not None else None
+
+    async def set_principal(self, principal: Principal, password_changed: str):
+        await self.store(self.status_key(principal.id), (password_changed, principal))
+
+    async def invalidate(self, user_id: UUID):
+        await super().invalidate(user_id)
+        await self.backend.delete(self.status_key(user_id))
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.principal_cache_ttl,
+    backend=InMemoryBackend(maxsize=settings.principal_cache_size),
+)
@@ -0,0 +1,142 @@
+"""
+The public room directory (``GET /rooms/v2`` and ``/rooms/v2/company``), rendered once per company.
+
+Every client loads the first page of the directory on launch, and building it joins the
+rooms with their counts. Entries keep a rendered page (JSON body plus the next-page
+cursor) and its ETag per company and variant (sort order). An entry is fresh for
+``settings.room_directory_ttl`` seconds; after that it is still served for up to
+``settings.room_directory_stale`` seconds while a background task rebuilds it.
+
+Entries live in the worker's memory. Rebuilds are single-flight per worker: a per-key
+``asyncio.Lock`` makes one request run the loader while concurrent requests of the same
+worker wait for its result, and at most one background refresh per key runs at a time.
+Each worker still builds its own copy, so a deployment runs up to one build per worker
+per key and TTL.
+
+Room changes made through ``app/routers/room/rooms.py`` call ``invalidate``, which bumps
+the generation of the company's directories (and of the public one), so entries of every
+variant built before the change are ignored. With ``settings.room_directory_redis`` the
+generations are kept in Redis and an invalidation reaches every worker; without it only
+the worker that made the change drops its entries, and the others catch up once theirs
+expire (up to ``room_directory_ttl + room_directory_stale`` seconds). Counts move with
+every message, so those are up to the TTL behind.
+"""
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from app.cache.backends import InMemoryBackend, RedisBackend, cache_logger
+from app.config.config import settings
+from app.config.etag import make_etag
+
+# Returns {"body": bytes, ...}; other keys (e.g. "next_cursor") are kept with the entry
+Loader = Callable[[], Awaitable[dict]]
+
+
+class RoomDirectoryCache:
+
+    def __init__(self, ttl: int, stale: int, backend: InMemoryBackend, shared=None):
+        self.ttl = ttl
+        self.stale = stale
+        self.backend = backend
+        self.shared = shared
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+
+    @staticmethod
+    def scope(company_id: Optional[UUID] = None) -> str:
+        return str(company_id or 'public')
+
+    def key(self, company_id: Optional[UUID] = None, variant: str = "") -> str:
+        return f"room_directory:{self.scope(company_id)}:{variant}"
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    @staticmethod
+    def generation_key(scope: str) -> str:
+        return f"room_directory_generation:{scope}"
+
+    async def _generation(self, scope: str):
+        shared = await self.shared.get(self.generation_key(scope)) if self.shared is not None else None
+        return self._epoch, self._generations.get(scope, 0), shared
+
+    async def _current(self, key: str, scope: str) -> Optional[dict]:
+        entry = await self.backend.get(key)
+        if entry is None or entry["generation"] != await self._generation(scope):
+            return None
+        return entry
+
+    async def get(self, company_id: Optional[UUID], variant: str, loader: Loader) -> dict:
+        """
+        Returns ``{"etag", "body", ...}`` for the directory of ``company_id`` (``None`` for the
+        public one). ``loader`` renders the page with its own session.
+        """
+        scope = self.scope(company_id)
+        key = self.key(company_id, variant)
+        entry = await self._current(key, scope)
+        if entry is not None:
+            self.hits += 1
+            if time.monotonic() - entry["built_at"] >= self.ttl:
+                self._refresh_in_background(key, scope, loader)
+            return entry
+
+        self.misses += 1
+        async with self._lock(key):
+            # Whoever held the lock may have just built it
+            entry = await self._current(key, scope)
+            if entry is None:
+                entry = await self._build(key, scope, loader)
+        return entry
+
+    async def _build(self, key: str, scope: str, loader: Loader) -> dict:
+        generation = await self._generation(scope)
+        page = await loader()
+        self.builds += 1
+        entry = dict(page, generation=generation, built_at=time.monotonic(), etag=make_etag(page["body"]))
+        # An invalidation during the build means the page may predate the change
+        if await self._generation(scope) == generation:
+            await self.backend.set(key, entry, self.ttl + self.stale)
+        return entry
+
+    def _refresh_in_background(self, key: str, scope: str, loader: Loader):
+        if key in self._refreshing or self._lock(key).locked():
+            return
+        task = asyncio.create_task(self._refresh(key, scope, loader))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, scope: str, loader: Loader):
+        try:
+            async with self._lock(key):
+                await self._build(key, scope, loader)
+        except Exception as e:
+            cache_logger.error(f"Room directory refresh {key} failed: {e}")
+
+    async def invalidate(self, company_id: Optional[UUID] = None):
+        """Drops every variant of the public directory and, if given, of the directory of ``company_id``."""
+        for scope in {self.scope(None), self.scope(company_id)}:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            if self.shared is not None:
+                # A fresh token rather than a counter: concurrent invalidations can't both write the same value.
+                # It outlives every entry built before it, so expiring it can't bring one back
+                await self.shared.set(self.generation_key(scope), uuid.uuid4().hex, self.ttl + self.stale)
+
+    async def clear(self):
+        self._epoch += 1
+        await self.backend.clear()
+
+
+room_directory_cache = RoomDirectoryCache(
+    ttl=settings.room_directory_ttl,
+    stale=settings.room_directory_stale,
+    backend=InMemoryBackend(maxsize=1024),
+    shared=RedisBackend() if settings.room_directory_redis else None,
+)
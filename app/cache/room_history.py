@@ -0,0 +1,81 @@
+"""
+Latest rendered messages per room.
+
+The first page of ``GET /messages/{room_id}`` is the hottest read in the API: every
+client polls it and the answer only changes when the room does. The cache keeps the
+newest ``settings.history_cache_size`` messages of a room, already decrypted and
+rendered to JSON-ready dicts, in an in-process tier and optionally in Redis.
+
+Each entry is stored with the room's ``room_stats.version``, which triggers bump on
+every change to the room's messages, including those posted by the websocket service,
+and with the user cards stamp, bumped whenever a user's name, avatar or verified flag
+changes; an entry is only served while both are unchanged. Writes made through this API
+also invalidate the room directly, and entries expire after ``settings.history_cache_ttl``.
+"""
+from typing import List, Optional
+from uuid import UUID
+
+from app.cache.backends import InMemoryBackend, RedisBackend
+from app.config.config import settings
+
+
+class RoomHistoryCache:
+
+    def __init__(self, size: int, ttl: int, local: InMemoryBackend, shared=None):
+        self.size = size
+        self.ttl = ttl
+        self.local = local
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(room_id: UUID) -> str:
+        return f"room_history:{room_id}"
+
+    def covers(self, limit: int) -> bool:
+        """Whether a first page of ``limit`` messages can be served from the cache."""
+        return 0 < limit <= self.size
+
+    async def get(self, room_id: UUID, limit: int, version: int, card_version: int = 0) -> Optional[List[dict]]:
+        """Returns the newest ``limit`` messages if they were cached at ``version`` of the room and ``card_version``."""
+        key = self.key(room_id)
+        entry = await self.local.get(key)
+        if entry is None and self.shared is not None:
+            entry = await self.shared.get(key)
+            if entry is not None:
+                await self.local.set(key, entry, self.ttl)
+        if entry is None or entry["version"] != version or entry.get("card_version", 0) != card_version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["messages"][:limit]
+
+    async def put(self, room_id: UUID, messages: List[dict], version: int, card_version: int = 0):
+        """Stores the newest messages of a room, newest first, as of ``version`` of the room and ``card_version``."""
+        key = self.key(room_id)
+        entry = {"version": version, "card_version": card_version, "messages": messages[:self.size]}
+        await self.local.set(key, entry, self.ttl)
+        if self.shared is not None:
+            await self.shared.set(key, entry, self.ttl)
+
+    async def invalidate(self, room_id: UUID):
+        if room_id is None:
+            return
+        key = self.key(room_id)
+        await self.local.delete(key)
+        if self.shared is not None:
+            await self.shared.delete(key)
+
+    async def clear(self):
+        await self.local.clear()
+        if self.shared is not None:
+            await self.shared.clear()
+
+
+room_history_cache = RoomHistoryCache(
+    size=settings.history_cache_size,
+    ttl=settings.history_cache_ttl,
+    local=InMemoryBackend(maxsize=settings.history_cache_rooms),
+    shared=RedisBackend() if settings.history_cache_redis else None,
+)
@@ -0,0 +1,66 @@
+"""
+Room metadata (name, owner, block and secret flags, company) keyed by room id.
+
+Many endpoints only load a room to check that it exists, who owns it or whether it is
+blocked. They read a ``RoomMeta`` from here instead of selecting the full row each time;
+endpoints that change a room keep loading the ORM object and call ``invalidate`` after
+committing. Changes made elsewhere (e.g. the scheduler deleting old rooms) show up once
+the entry expires after ``settings.room_meta_ttl``.
+
+Lookups by name go through ``get_by_name``, which caches the name's room id and checks it
+against the id entry, so a rename or delete (which invalidates the id) also drops the name.
+"""
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.cache.backends import InMemoryBackend, KeyedCache
+from app.config.config import settings
+from app.models import room_model
+from app.schemas.room import RoomMeta
+
+
+class RoomMetaCache(KeyedCache):
+    prefix = "room_meta"
+
+    async def get(self, room_id: UUID, session: AsyncSession) -> Optional[RoomMeta]:
+        """Returns the room's metadata, or ``None`` if there is no such room. Missing rooms are not cached."""
+        meta = await self.lookup(self.key(room_id))
+        if meta is not None:
+            return meta
+
+        result = await session.execute(
+            select(room_model.Rooms.id, room_model.Rooms.name_room, room_model.Rooms.owner,
+                   room_model.Rooms.block, room_model.Rooms.secret_room, room_model.Rooms.company_id)
+            .where(room_model.Rooms.id == room_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        meta = RoomMeta.model_validate(row)
+        await self.store(self.key(room_id), meta)
+        return meta
+
+    async def get_by_name(self, name_room: str, session: AsyncSession) -> Optional[RoomMeta]:
+        """Like ``get`` for the room called ``name_room``."""
+        name_key = self.key(f"name:{name_room}")
+        room_id = await self.lookup(name_key)
+        if room_id is not None:
+            meta = await self.get(room_id, session)
+            if meta is not None and meta.name_room == name_room:
+                return meta
+
+        result = await session.execute(select(room_model.Rooms.id).where(room_model.Rooms.name_room == name_room))
+        room_id = result.scalar_one_or_none()
+        if room_id is None:
+            return None
+        await self.store(name_key, room_id)
+        return await self.get(room_id, session)
+
+
+room_meta_cache = RoomMetaCache(
+    ttl=settings.room_meta_ttl,
+    backend=InMemoryBackend(maxsize=settings.room_meta_cache_size),
+)
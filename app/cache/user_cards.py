@@ -0,0 +1,62 @@
+"""
+User cards (name, avatar, verified flag) keyed by user id.
+
+Message history, direct message lists and follower lists all show the same few
+user fields for every row. Instead of joining ``users`` into each of those queries,
+they look the cards up here in one batch; misses are loaded with a single
+``WHERE id IN (...)`` query.
+
+Profile endpoints that change a card call ``invalidate``; other changes (e.g. an
+admin verifying a user) show up once the entry expires after ``settings.user_card_ttl``.
+"""
+from typing import Dict, Iterable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.cache.backends import InMemoryBackend, KeyedCache
+from app.config.config import settings
+from app.models import user_model
+from app.schemas.user import UserCard
+
+
+class UserCardCache(KeyedCache):
+    prefix = "user_card"
+
+    async def get_many(self, user_ids: Iterable[UUID], session: AsyncSession) -> Dict[UUID, UserCard]:
+        """
+        Returns the cards of the given users. Unknown or deleted users are left out.
+        """
+        cards = {}
+        missing = []
+        for user_id in set(user_ids):
+            if user_id is None:
+                continue
+            card = await self.lookup(self.key(user_id))
+            if card is None:
+                missing.append(user_id)
+            else:
+                cards[user_id] = card
+
+        if missing:
+            result = await session.execute(
+                select(user_model.User.id, user_model.User.user_name, user_model.User.full_name,
+                       user_model.User.avatar, user_model.User.verified)
+                .where(user_model.User.id.in_(missing))
+            )
+            for row in result.all():
+                card = UserCard.model_validate(row)
+                await self.store(self.key(row.id), card)
+                cards[row.id] = card
+
+        return cards
+
+    async def get(self, user_id: UUID, session: AsyncSession):
+        return (await self.get_many([user_id], session)).get(user_id)
+
+
+user_card_cache = UserCardCache(
+    ttl=settings.user_card_ttl,
+    backend=InMemoryBackend(maxsize=settings.user_card_cache_size),
+)
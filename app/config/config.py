@@ -1,10 +1,7 @@
+from typing import List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-<<<<<<< HEAD
-import json
-import os
-=======
 
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
 class Settings(BaseSettings):
     mail_username: str
@@ -14,11 +11,7 @@ class Settings(BaseSettings):
     mail_server: str
 
     mail_from_name: str
-<<<<<<< HEAD
-    mail_from_name_company: str
-=======
     # mail_from_name_company: str
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
     database_name: str
     database_username: str
@@ -33,46 +26,59 @@ class Settings(BaseSettings):
     algorithm: str
     access_token_expire_minutes: int
 
-<<<<<<< HEAD
-    supabase_url: str
-    supabase_key: str
-    backblaze_id: str
-    backblaze_key: str
-
-=======
     backblaze_id: str
     backblaze_key: str
 
     # database_name_company: str
     # database_username_company: str
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     url_address_dns: str
     # url_address_dns_company: str
 
     key_crypto: str
+    # Envelope written for new messages: 2 = AES-GCM, 1 = Fernet, 0 = legacy double base64.
+    # Readers that predate envelopes only understand 0; raise it once every service that
+    # reads chat_messages handles the "v1:"/"v2:" prefixes
+    crypto_envelope_version: int = 0
+    # Message decryption pool: 0 sizes it to the CPU count
+    decrypt_workers: int = 0
+    decrypt_cache_size: int = 4096
+    # Room history cache: newest messages kept per room (0 disables), seconds to keep them,
+    # rooms kept per worker, and whether workers share entries through Redis
+    history_cache_size: int = 50
+    history_cache_ttl: int = 60
+    history_cache_rooms: int = 1024
+    history_cache_redis: bool = False
+    # User cards (name, avatar, verified) shown next to messages and followers
+    user_card_ttl: int = 300
+    user_card_cache_size: int = 10000
+    # Authenticated users behind access tokens, so most requests authenticate without a query
+    principal_cache_ttl: int = 5
+    principal_cache_size: int = 10000
+    # Password hashing: bcrypt cost of new hashes (older ones are upgraded at login), threads
+    # that run bcrypt, and how many calls may wait for a thread before requests get a 503
+    bcrypt_rounds: int = 12
+    password_workers: int = 4
+    password_queue_size: int = 64
+    # Public room directory: seconds an entry is fresh, how long after that a stale entry is
+    # still served while one request rebuilds it in the background, and whether invalidations
+    # reach every worker through Redis (otherwise other workers see room changes within ttl + stale)
+    room_directory_ttl: int = 30
+    room_directory_stale: int = 60
+    room_directory_redis: bool = False
+    # Room metadata (name, owner, block, secret, company) for existence and permission checks
+    room_meta_ttl: int = 60
+    room_meta_cache_size: int = 10000
+    # Messages deleted per transaction when a room is removed
+    room_delete_chunk_size: int = 5000
+    # Default room images: where the background refill gets them, how many are kept ready,
+    # and the URLs used when the pool is empty (defaults to start_app.default_room_image)
+    room_image_source_url: str = "https://random.imagecdn.app/v1/image?width=200&height=300&category=photos&format=json"
+    room_image_pool_size: int = 50
+    room_image_fallbacks: List[str] = []
     rout_image: str
     bucket_name_user_avatar: str
     bucket_name_room_image: str
     openai_api_key: str
-<<<<<<< HEAD
-    users_data_file: str
-
-    
-    model_config = SettingsConfigDict(env_file = ".env")
-    
-    def load_users_data(self):
-        if not os.path.exists(self.users_data_file):
-            print(f"Warning: File {self.users_data_file} not found. Loading default users data.")
-            return []  # Or return a default configuration if appropriate
-        with open(self.users_data_file, 'r') as file:
-            users_data_json = json.load(file)
-        return users_data_json
-
-
-
-settings = Settings()
-users_data = settings.load_users_data()
-=======
 
     # sentry_url: str
 
@@ -83,4 +89,3 @@ users_data = settings.load_users_data()
     
 
 settings = Settings()
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
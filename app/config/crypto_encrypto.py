@@ -1,52 +1,228 @@
+import asyncio
 import base64
+import binascii
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from app.config.config import settings 
-<<<<<<< HEAD
-   
-=======
 import secrets
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
    
 key = settings.key_crypto
 cipher = Fernet(key)
 
-def is_base64(s):
-    try:
-        return base64.b64encode(base64.b64decode(s)).decode('utf-8') == s
-    except Exception:
-        return False
+# Message envelope
+#
+# Stored message values carry a short version prefix so the cipher is picked with one
+# ``startswith`` instead of a base64 round trip over the whole payload:
+#
+#   version 0  base64(Fernet token), no prefix. Written before envelopes existed; every
+#              Fernet token starts with "gAAAAA", which base64-encodes to "Z0FBQUFB".
+#   version 1  "v1:" + Fernet token, without the second base64 layer.
+#   version 2  "v2:" + urlsafe-base64(nonce || AES-256-GCM ciphertext || tag), unpadded.
+#
+# Anything else is a plaintext message and is returned unchanged, and so is a value whose
+# payload is not base64 at all (say, a plaintext "v2: release notes"). A well-formed payload
+# that fails authentication reads as ``None``: ciphertext is never handed back to clients.
+
+LEGACY_PREFIX = "Z0FBQUFB"
+FERNET_PREFIX = "v1:"
+AESGCM_PREFIX = "v2:"
+AESGCM_NONCE_SIZE = 12
+URLSAFE_B64 = re.compile(r"[A-Za-z0-9_-]+=*")
+
+# AES-GCM key derived from the Fernet key, so no extra secret has to be deployed
+aesgcm = AESGCM(HKDF(algorithm=hashes.SHA256(),
+                     length=32,
+                     salt=None,
+                     info=b"chat-message-envelope-v2").derive(base64.urlsafe_b64decode(key)))
+
+
+def _is_envelope_payload(data: str, alphabet) -> bool:
+    return bool(data) and alphabet.fullmatch(data) is not None
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def encrypt(data: str, version: int = settings.crypto_envelope_version) -> str:
+    """
+    Encrypts a message into the envelope format of the given version.
+    """
+    if version == 2:
+        nonce = os.urandom(AESGCM_NONCE_SIZE)
+        sealed = aesgcm.encrypt(nonce, data.encode('utf-8'), AESGCM_PREFIX.encode('ascii'))
+        return AESGCM_PREFIX + _b64encode(nonce + sealed)
+    if version == 1:
+        return FERNET_PREFIX + cipher.encrypt(data.encode('utf-8')).decode('ascii')
+    if version == 0:
+        return base64.b64encode(cipher.encrypt(data.encode('utf-8'))).decode('utf-8')
+    raise ValueError(f"Unknown envelope version: {version}")
 
-<<<<<<< HEAD
 
-async def async_decrypt(encoded_data: str):
-    if not is_base64(encoded_data):
-       
-        return encoded_data  
-=======
 async def async_encrypt(data: str):
     if data is None:
         return None
-    encrypted = cipher.encrypt(data.encode())
-    encoded_string = base64.b64encode(encrypted).decode('utf-8')
-    return encoded_string
+    return encrypt(data)
 
-async def async_decrypt(encoded_data: str):
 
-    if not is_base64(encoded_data):
+def decrypt(encoded_data: str):
+    """
+    Synchronous core of ``async_decrypt``. Safe to call from worker threads.
+
+    Returns the plaintext, the value itself when it is not encrypted, or ``None`` when
+    an encrypted value fails authentication.
+    """
+    if not encoded_data:
         return encoded_data
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
     try:
-        encrypted = base64.b64decode(encoded_data.encode('utf-8'))
-        decrypted = cipher.decrypt(encrypted).decode('utf-8')
-        return decrypted
-<<<<<<< HEAD
-    except InvalidToken:
-        return None
-=======
-    except InvalidToken as e:
+        if encoded_data.startswith(AESGCM_PREFIX):
+            payload = encoded_data[len(AESGCM_PREFIX):]
+            if not _is_envelope_payload(payload, URLSAFE_B64):
+                return encoded_data
+            sealed = _b64decode(payload)
+            return aesgcm.decrypt(sealed[:AESGCM_NONCE_SIZE], sealed[AESGCM_NONCE_SIZE:],
+                                  AESGCM_PREFIX.encode('ascii')).decode('utf-8')
+        if encoded_data.startswith(FERNET_PREFIX):
+            payload = encoded_data[len(FERNET_PREFIX):]
+            if not _is_envelope_payload(payload, URLSAFE_B64):
+                return encoded_data
+            return cipher.decrypt(payload.encode('ascii')).decode('utf-8')
+        if encoded_data.startswith(LEGACY_PREFIX):
+            try:
+                encrypted = base64.b64decode(encoded_data.encode('utf-8'), validate=True)
+            except binascii.Error:
+                return encoded_data
+            return cipher.decrypt(encrypted).decode('utf-8')
+    except (InvalidToken, InvalidTag, binascii.Error, ValueError):
         return None
 
+    return encoded_data
+
+
+async def async_decrypt(encoded_data: str):
+    return decrypt(encoded_data)
+
+
+# Batch decryption
+
+_MISSING = object()
+
+
+class PlaintextCache:
+    """
+    Bounded LRU of recently decrypted messages keyed by a digest of the ciphertext.
+
+    Only touched from the event loop thread, so it needs no locking.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(encoded_data: str) -> bytes:
+        return hashlib.blake2b(encoded_data.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, digest: bytes):
+        value = self._data.get(digest, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return _MISSING
+        self._data.move_to_end(digest)
+        self.hits += 1
+        return value
+
+    def put(self, digest: bytes, value: Optional[str]):
+        if self.maxsize <= 0:
+            return
+        self._data[digest] = value
+        self._data.move_to_end(digest)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+decrypt_workers = settings.decrypt_workers or os.cpu_count() or 1
+decrypt_executor = ThreadPoolExecutor(max_workers=decrypt_workers, thread_name_prefix="decrypt")
+plaintext_cache = PlaintextCache(settings.decrypt_cache_size)
+
+
+def _decrypt_chunk(chunk: List[str]) -> List[Optional[str]]:
+    return [decrypt(encoded_data) for encoded_data in chunk]
+
+
+async def async_decrypt_many(values: Sequence[Optional[str]], use_cache: bool = True) -> List[Optional[str]]:
+    """
+    Decrypts a whole page of messages in the worker pool and returns the plaintexts in input order.
+
+    Recently seen ciphertexts are answered from ``plaintext_cache`` so hot rooms that are polled
+    repeatedly are not decrypted again; only the misses are split into one chunk per worker.
+
+    Args:
+        values (Sequence[Optional[str]]): Stored message values; ``None`` entries stay ``None``.
+        use_cache (bool): Read and fill the plaintext LRU. Disable for one-off bulk reads such
+            as exports so they do not evict the hot set.
+
+    Returns:
+        List[Optional[str]]: The decrypted values, ``None`` where a token is invalid.
+    """
+    results: List[Optional[str]] = [None] * len(values)
+    pending_index: List[int] = []
+    pending_digest: List[bytes] = []
+
+    for index, encoded_data in enumerate(values):
+        if encoded_data is None:
+            continue
+        if use_cache:
+            digest = plaintext_cache.digest(encoded_data)
+            cached = plaintext_cache.get(digest)
+            if cached is not _MISSING:
+                results[index] = cached
+                continue
+            pending_digest.append(digest)
+        pending_index.append(index)
+
+    if not pending_index:
+        return results
+
+    pending = [values[index] for index in pending_index]
+    chunk_size = -(-len(pending) // decrypt_workers)
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+
+    loop = asyncio.get_running_loop()
+    decrypted_chunks = await asyncio.gather(
+        *(loop.run_in_executor(decrypt_executor, _decrypt_chunk, chunk) for chunk in chunks)
+    )
+
+    position = 0
+    for decrypted_chunk in decrypted_chunks:
+        for plaintext in decrypted_chunk:
+            results[pending_index[position]] = plaintext
+            if use_cache:
+                plaintext_cache.put(pending_digest[position], plaintext)
+            position += 1
+
+    return results
+
 
 # Generate a key and instantiate a Fernet instance
 cipher_suite = Fernet(key)
@@ -73,4 +249,3 @@ async def decrypt_token(token: str) -> str:
     # Decrypt the email
     decrypted_email = cipher_suite.decrypt(encrypted_email.encode())
     return decrypted_email.decode()
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
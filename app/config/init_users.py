@@ -1,51 +1,3 @@
-<<<<<<< HEAD
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from .config import users_data
-from fastapi import Depends
-from app.database.async_db import get_async_session
-from app.models import user_model, room_model
-from app.config import utils, config
-
-
-
-async def create_initial_users(db: AsyncSession = Depends(get_async_session)):
-    users_data = config.users_data
-
-    for user_data in users_data:
-        # Check if a user with the same email or user_name already exists
-        existing_user = await db.execute(
-            select(user_model.User).filter(
-                (user_model.User.email == user_data['email']) |
-                (user_model.User.user_name == user_data['user_name'])
-            )
-        )
-        existing_user = existing_user.scalars().first()
-        if existing_user:
-            print(f"User with email {user_data['email']} or username {user_data['user_name']} already exists.")
-            continue  # Skip this user
-
-        user = user_model.User(
-            user_name=user_data["user_name"],
-            email=user_data["email"],
-            password=utils.hash_password(user_data["password"]),
-            avatar=user_data["avatar"]
-        )
-        db.add(user)
-
-    await db.commit()
-    
-    
-    
-async def create_room(engine_asinc):
-        async with AsyncSession(engine_asinc) as session:
-        # Check if the room already exists
-            existing_room = await session.execute(select(room_model.Rooms).filter_by(name_room='Hell'))
-            existing_room = existing_room.scalars().first()
-            if existing_room is None:
-                new_room = room_model.Rooms(name_room='Hell', image_room='Hell', owner=None, secret_room=True)
-=======
-
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from _log_config.log_config import get_logger
@@ -122,7 +74,6 @@ async def create_initial_users(db: AsyncSession = Depends(get_async_session)):
 
             user_status = user_model.UserStatus(user_id=user.id,
                                                 user_name=user.user_name,
-                                                name_room=hell_room.name_room,
                                                 room_id=hell_room.id)
             db.add(user_status)
 
@@ -162,14 +113,10 @@ async def create_room(engine_asinc_db):
                                             owner=user.id,
                                             secret_room=True,
                                             company_id=company_id.id)
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
                 session.add(new_room)
                 await session.commit()
             else:
                 print("Room 'Hell' already exists, skipping insertion.")
-<<<<<<< HEAD
-            await create_initial_users(session)
-=======
             await create_initial_users(session)
     except Exception as e:
         init_logger.error(f"Error in create_room: {e}")
@@ -191,4 +138,3 @@ async def get_company(session):
         init_logger.error(f"Error getting company {e}")
         print(f"Error in get_company: {e}")
 
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
@@ -1,20 +1,95 @@
-import requests
+"""
+Default images for new rooms.
+
+Room creation takes an image URL from ``room_image_pool`` instead of asking the image CDN
+while the request waits. The pool keeps up to ``settings.room_image_pool_size`` URLs and
+refills itself in the background with httpx whenever it drops below half of that (and once
+at startup). When it is empty, e.g. because the CDN is down, a URL from
+``settings.room_image_fallbacks`` (or ``start_app.default_room_image``) is used, so taking
+an image never makes an outbound call.
+"""
+import asyncio
+import random
+from collections import deque
+from typing import Optional, Sequence
+
+import httpx
+
 from _log_config.log_config import get_logger
+from app.config.config import settings
+from app.config.start_schema import start_app
 
 image_logger = get_logger('image_fetch', 'image_fetch.log')
 
-async def fetch_image_url():
-    try:
-        url = "https://random.imagecdn.app/v1/image?width=200&height=300&category=photos&format=json"
-        response = requests.get(url)
 
-        if response.status_code == 200:
-            data = response.json()
-            image_url = data['url']
-            return image_url
+class ImagePool:
+
+    def __init__(self, source_url: str, size: int, fallbacks: Sequence[str],
+                 concurrency: int = 4, timeout: float = 10):
+        self.source_url = source_url
+        self.size = size
+        self.fallbacks = list(fallbacks)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.urls = deque(maxlen=size)
+        self._refill_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def take(self) -> str:
+        """Returns a pre-fetched image URL, or a fallback if the pool is empty, and tops the pool up."""
+        if self.urls:
+            self.hits += 1
+            url = self.urls.popleft()
         else:
-            return "Error fetching image"
-    except Exception as e:
+            self.misses += 1
+            url = random.choice(self.fallbacks)
+        self.refill()
+        return url
+
+    def refill(self):
+        """Starts a background refill if the pool is below half full and none is running."""
+        if len(self.urls) >= self.size // 2 or (self._refill_task and not self._refill_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refill_task = loop.create_task(self.fill())
+
+    async def fill(self):
+        """Fetches URLs until the pool is full; stops early on a round in which every request failed."""
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                while len(self.urls) < self.size:
+                    batch = min(self.concurrency, self.size - len(self.urls))
+                    results = await asyncio.gather(*(self._fetch(client) for _ in range(batch)),
+                                                   return_exceptions=True)
+                    urls = [result for result in results if isinstance(result, str)]
+                    if not urls:
+                        image_logger.error(f"Error fetching images: {results[0]}")
+                        return
+                    self.urls.extend(urls)
+        except Exception as e:
+            image_logger.error(f"Error refilling the image pool: {e}")
+
+    async def _fetch(self, client: httpx.AsyncClient) -> str:
+        response = await client.get(self.source_url)
+        response.raise_for_status()
+        return response.json()['url']
+
+    async def close(self):
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+
+
+room_image_pool = ImagePool(
+    source_url=settings.room_image_source_url,
+    size=settings.room_image_pool_size,
+    fallbacks=settings.room_image_fallbacks or [start_app.default_room_image],
+)
+
 
-        image_logger.error(f"Error fetching image: {e}")
-        return "Error fetching image"
+async def fetch_image_url() -> str:
+    """A default image for a new room, from ``room_image_pool``."""
+    return room_image_pool.take()
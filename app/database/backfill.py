@@ -0,0 +1,229 @@
+"""
+One-shot maintenance commands for denormalized data.
+
+Run from the project root, e.g.::
+
+    python -m app.database.backfill vote_count room_stats
+
+``room_ids`` can run at any time; ``drop_room_names`` removes the room-name columns of
+``chat_messages`` and ``user_status`` for good.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import func, update, exists, text
+from sqlalchemy.future import select
+
+from _log_config.log_config import get_logger
+from app.database.async_db import async_session_maker
+from app.models import messages_model
+
+backfill_logger = get_logger('backfill', 'backfill.log')
+
+
+async def backfill_vote_count():
+    """
+    Recomputes ``chat_messages.vote_count`` from ``chat_message_votes``.
+
+    Returns:
+        int: The number of messages whose counter was corrected.
+    """
+    totals = (
+        select(
+            messages_model.ChatMessageVote.message_id,
+            func.coalesce(func.sum(messages_model.ChatMessageVote.dir), 0).label('total')
+        )
+        .group_by(messages_model.ChatMessageVote.message_id)
+        .subquery()
+    )
+    async with async_session_maker() as session:
+        voted = await session.execute(
+            update(messages_model.ChatMessages)
+            .where(messages_model.ChatMessages.id == totals.c.message_id,
+                   messages_model.ChatMessages.vote_count != totals.c.total)
+            .values(vote_count=totals.c.total)
+        )
+        # Messages whose votes were all removed while the counter was not maintained
+        unvoted = await session.execute(
+            update(messages_model.ChatMessages)
+            .where(messages_model.ChatMessages.vote_count != 0,
+                   ~exists().where(messages_model.ChatMessageVote.message_id == messages_model.ChatMessages.id))
+            .values(vote_count=0)
+        )
+        await session.commit()
+    return voted.rowcount + unvoted.rowcount
+
+
+# Recomputes every room's stats from the source tables and writes only the rows that drifted;
+# changed rows get fresh version stamps so ETags and caches built on them are dropped.
+# The counts come from the statement snapshot, so a row is only overwritten if the triggers have
+# not touched it since (same version and member count, rechecked on the locked row); otherwise the
+# increments committed in between would be lost. Skipped rooms are corrected on the next run.
+RECONCILE_ROOM_STATS = text("""
+    WITH messages AS (
+        SELECT room_id, count(*) AS message_count, max(created_at) AS last_message_at
+        FROM chat_messages
+        WHERE room_id IS NOT NULL
+        GROUP BY room_id
+    ), members AS (
+        SELECT room_id, count(*) AS member_count
+        FROM user_status
+        GROUP BY room_id
+    ), actual AS (
+        SELECT rooms.id AS room_id,
+               COALESCE(messages.message_count, 0) AS message_count,
+               messages.last_message_at,
+               (SELECT chat_messages.id FROM chat_messages
+                WHERE chat_messages.room_id = rooms.id
+                ORDER BY chat_messages.created_at DESC, chat_messages.id DESC
+                LIMIT 1) AS last_message_id,
+               COALESCE(members.member_count, 0) AS member_count,
+               room_stats.version AS seen_version,
+               room_stats.member_count AS seen_member_count
+        FROM rooms
+        LEFT JOIN messages ON messages.room_id = rooms.id
+        LEFT JOIN members ON members.room_id = rooms.id
+        LEFT JOIN room_stats ON room_stats.room_id = rooms.id
+    ), corrected AS (
+        UPDATE room_stats SET message_count = actual.message_count,
+                              last_message_at = actual.last_message_at,
+                              last_message_id = actual.last_message_id,
+                              member_count = actual.member_count,
+                              version = nextval('room_stats_version_seq')
+        FROM actual
+        WHERE room_stats.room_id = actual.room_id
+          AND room_stats.version = actual.seen_version
+          AND room_stats.member_count = actual.seen_member_count
+          AND (room_stats.message_count, room_stats.last_message_at, room_stats.last_message_id,
+               room_stats.member_count)
+              IS DISTINCT FROM
+              (actual.message_count, actual.last_message_at, actual.last_message_id, actual.member_count)
+        RETURNING room_stats.room_id
+    ), added AS (
+        INSERT INTO room_stats (room_id, message_count, last_message_at, last_message_id, member_count, version)
+        SELECT room_id, message_count, last_message_at, last_message_id, member_count,
+               nextval('room_stats_version_seq')
+        FROM actual
+        WHERE seen_version IS NULL
+        ON CONFLICT (room_id) DO NOTHING
+        RETURNING room_id
+    )
+    SELECT (SELECT count(*) FROM corrected) + (SELECT count(*) FROM added)
+""")
+
+
+async def backfill_room_stats(session_factory=async_session_maker):
+    """
+    Brings ``room_stats`` in line with ``chat_messages``, ``user_status`` and ``rooms``.
+
+    The triggers keep the table current; this fills it for existing data and repairs drift
+    (e.g. rows changed while the triggers were being installed). The scheduler runs it hourly.
+    Rooms written to while it counts are left alone and picked up by the next run.
+
+    Returns:
+        int: The number of rooms inserted or corrected.
+    """
+    async with session_factory() as session:
+        corrected = (await session.execute(RECONCILE_ROOM_STATS)).scalar()
+        await session.commit()
+    return corrected
+
+
+ROOM_NAMES_EXIST = text("""
+    SELECT EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_name = 'chat_messages' AND column_name = 'rooms')
+""")
+
+FILL_ROOM_IDS = text("""
+    UPDATE chat_messages SET room_id = rooms.id
+    FROM rooms
+    WHERE rooms.name_room = chat_messages.rooms
+      AND chat_messages.id IN (SELECT chat_messages.id FROM chat_messages
+                               JOIN rooms ON rooms.name_room = chat_messages.rooms
+                               WHERE chat_messages.room_id IS NULL
+                               LIMIT :batch_size)
+""")
+
+# Messages without a room id at this point belong to rooms that no longer exist; the name
+# foreign key used to cascade them away. Reports and notifications do not cascade.
+DELETE_ORPHAN_MESSAGES = [
+    "DELETE FROM notifications WHERE message_id IN (SELECT id FROM chat_messages WHERE room_id IS NULL) "
+    "OR report_id IN (SELECT reports.id FROM reports JOIN chat_messages ON chat_messages.id = reports.message_id "
+    "WHERE chat_messages.room_id IS NULL)",
+    "DELETE FROM reports WHERE message_id IN (SELECT id FROM chat_messages WHERE room_id IS NULL)",
+    "DELETE FROM chat_messages WHERE room_id IS NULL",
+]
+
+DROP_ROOM_NAMES = [
+    "DROP TRIGGER IF EXISTS trg_chat_messages_room_id_from_name ON chat_messages",
+    "DROP FUNCTION IF EXISTS chat_messages_room_id_from_name()",
+    "ALTER TABLE chat_messages DROP COLUMN IF EXISTS rooms",
+    "ALTER TABLE user_status DROP COLUMN IF EXISTS name_room",
+]
+
+
+async def backfill_room_ids(session_factory=async_session_maker, batch_size: int = 10000):
+    """
+    Sets ``chat_messages.room_id`` from the room name on messages written without one,
+    ``batch_size`` rows per transaction. Does nothing once the name column is dropped.
+
+    Returns:
+        int: The number of messages updated.
+    """
+    updated = 0
+    async with session_factory() as session:
+        if not (await session.execute(ROOM_NAMES_EXIST)).scalar():
+            return 0
+        while True:
+            result = await session.execute(FILL_ROOM_IDS, {"batch_size": batch_size})
+            await session.commit()
+            updated += result.rowcount
+            if result.rowcount < batch_size:
+                return updated
+
+
+async def drop_room_names(session_factory=async_session_maker):
+    """
+    Finishes keying messages and statuses by room id: fills the remaining room ids, deletes
+    the messages whose room is gone, and drops ``chat_messages.rooms`` and ``user_status.name_room``
+    together with the trigger that filled room ids from them. Run it once no service writes the
+    names any more; it cannot be undone.
+
+    Returns:
+        int: The number of orphaned messages deleted.
+    """
+    await backfill_room_ids(session_factory)
+    async with session_factory() as session:
+        if not (await session.execute(ROOM_NAMES_EXIST)).scalar():
+            return 0
+        for statement in DELETE_ORPHAN_MESSAGES:
+            result = await session.execute(text(statement))
+        for statement in DROP_ROOM_NAMES:
+            await session.execute(text(statement))
+        await session.commit()
+    return result.rowcount
+
+
+COMMANDS = {
+    "vote_count": backfill_vote_count,
+    "room_stats": backfill_room_stats,
+    "room_ids": backfill_room_ids,
+    "drop_room_names": drop_room_names,
+}
+
+
+async def run(names):
+    for name in names:
+        try:
+            changed = await COMMANDS[name]()
+            backfill_logger.info(f"Backfill {name}: {changed} rows updated")
+            print(f"{name}: {changed} rows updated")
+        except Exception as e:
+            backfill_logger.error(f"Backfill {name} failed: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild denormalized data from source tables.")
+    parser.add_argument("commands", nargs="+", choices=sorted(COMMANDS))
+    asyncio.run(run(parser.parse_args().commands))
@@ -0,0 +1,272 @@
+import hashlib
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from _log_config.log_config import get_logger
+
+migrations_logger = get_logger('migrations', 'migrations.log')
+
+
+# Any number such that no other code takes the same advisory lock
+MIGRATIONS_LOCK_ID = 7_102_311
+
+
+def add_column(table: str, column: str, definition: str) -> str:
+    """``ADD COLUMN IF NOT EXISTS`` locks the table even when the column exists; check the catalog first."""
+    return f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_name = '{table}' AND column_name = '{column}') THEN
+            ALTER TABLE {table} ADD COLUMN {column} {definition};
+        END IF;
+    END $$
+    """
+
+
+def index(name: str, table: str, columns: str) -> str:
+    """``CREATE INDEX IF NOT EXISTS`` blocks writes to the table even when the index exists; check first."""
+    return f"""
+    DO $$
+    BEGIN
+        IF to_regclass('{name}') IS NULL THEN
+            CREATE INDEX {name} ON {table} ({columns});
+        END IF;
+    END $$
+    """
+
+
+def drop_column(table: str, column: str) -> str:
+    return f"""
+    DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_name = '{table}' AND column_name = '{column}') THEN
+            ALTER TABLE {table} DROP COLUMN {column};
+        END IF;
+    END $$
+    """
+
+
+def drop_index(name: str) -> str:
+    return f"""
+    DO $$
+    BEGIN
+        IF to_regclass('{name}') IS NOT NULL THEN
+            DROP INDEX {name};
+        END IF;
+    END $$
+    """
+
+
+def trigger(name: str, table: str, definition: str) -> str:
+    """
+    A statement that creates trigger ``name`` on ``table`` only when it is missing or ``definition``
+    changed. ``CREATE TRIGGER`` locks the table against every reader and writer, so an unchanged
+    trigger is left alone; the definition is fingerprinted in the trigger's comment.
+    """
+    fingerprint = hashlib.md5(definition.encode()).hexdigest()
+    return f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger
+                       WHERE tgrelid = '{table}'::regclass AND tgname = '{name}'
+                         AND obj_description(oid, 'pg_trigger') = '{fingerprint}') THEN
+            DROP TRIGGER IF EXISTS {name} ON {table};
+            CREATE TRIGGER {name} {definition};
+            COMMENT ON TRIGGER {name} ON {table} IS '{fingerprint}';
+        END IF;
+    END $$
+    """
+
+
+# ``create_all`` only creates missing tables, so columns, indexes and triggers
+# added to existing tables are applied here. Every statement must be idempotent and
+# cheap when there is nothing to do: it runs on each startup of each worker.
+MIGRATIONS = [
+    # Keyset pagination of room history
+    index("ix_chat_messages_room_id_created_at_id", "chat_messages", "room_id, created_at DESC, id DESC"),
+
+    # Denormalized vote counter, filled by `python -m app.database.backfill vote_count`
+    add_column("chat_messages", "vote_count", "INTEGER NOT NULL DEFAULT 0"),
+
+    # room_stats follows chat_messages, rooms and user_status, whichever service writes them.
+    # `version` changes whenever a room's history or settings change; it is drawn from a sequence,
+    # so it also orders changes across rooms. It is only read by room id, and every message, vote
+    # and status change updates the row, so it is deliberately not indexed: updates stay HOT.
+    # Filled for existing data by `python -m app.database.backfill room_stats`; the scheduler
+    # re-runs the same reconcile hourly to repair any drift.
+    add_column("room_stats", "last_message_id", "UUID"),
+    add_column("room_stats", "version", "BIGINT NOT NULL DEFAULT 0"),
+    add_column("room_stats", "member_count", "BIGINT NOT NULL DEFAULT 0"),
+    add_column("room_stats", "last_message_at", "TIMESTAMP WITH TIME ZONE"),
+    drop_index("ix_room_stats_version"),
+    drop_index("ix_room_stats_member_version"),
+
+    # Keyset pagination of the room directory, one index per indexed sort order
+    index("ix_room_stats_message_count_room_id", "room_stats", "message_count DESC, room_id DESC"),
+    index("ix_room_stats_member_count_room_id", "room_stats", "member_count DESC, room_id DESC"),
+    index("ix_rooms_company_id_created_at_id", "rooms", "company_id, created_at DESC, id DESC"),
+    index("ix_rooms_company_id_name_room_id", "rooms", "company_id, name_room, id"),
+    # Messages and statuses are keyed by room_id alone. The copies of the room name lose their
+    # foreign keys (so renaming a room no longer rewrites its messages) and their NOT NULL. Until
+    # `python -m app.database.backfill drop_room_names` drops them, a trigger fills in room_id for
+    # writers that still send only the name. Each step checks the catalog first, so once applied
+    # the block takes no table locks.
+    """
+    DO $$
+    DECLARE fk record;
+    BEGIN
+        FOR fk IN
+            SELECT conrelid::regclass AS tbl, conname FROM pg_constraint
+            WHERE contype = 'f' AND confrelid = 'rooms'::regclass
+              AND conrelid IN ('chat_messages'::regclass, 'user_status'::regclass)
+              AND confkey = ARRAY[(SELECT attnum FROM pg_attribute
+                                   WHERE attrelid = 'rooms'::regclass AND attname = 'name_room')]
+        LOOP
+            EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.tbl, fk.conname);
+        END LOOP;
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_name = 'user_status' AND column_name = 'name_room' AND is_nullable = 'NO') THEN
+            ALTER TABLE user_status ALTER COLUMN name_room DROP NOT NULL;
+        END IF;
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_name = 'chat_messages' AND column_name = 'rooms' AND is_nullable = 'NO') THEN
+            ALTER TABLE chat_messages ALTER COLUMN rooms DROP NOT NULL;
+        END IF;
+        IF EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_name = 'chat_messages' AND column_name = 'rooms') THEN
+            CREATE OR REPLACE FUNCTION chat_messages_room_id_from_name() RETURNS trigger AS $fn$
+            BEGIN
+                IF NEW.room_id IS NULL AND NEW.rooms IS NOT NULL THEN
+                    SELECT id INTO NEW.room_id FROM rooms WHERE name_room = NEW.rooms;
+                END IF;
+                RETURN NEW;
+            END;
+            $fn$ LANGUAGE plpgsql;
+            IF NOT EXISTS (SELECT 1 FROM pg_trigger
+                           WHERE tgrelid = 'chat_messages'::regclass
+                             AND tgname = 'trg_chat_messages_room_id_from_name') THEN
+                CREATE TRIGGER trg_chat_messages_room_id_from_name
+                BEFORE INSERT ON chat_messages
+                FOR EACH ROW EXECUTE FUNCTION chat_messages_room_id_from_name();
+            END IF;
+        END IF;
+    END $$
+    """,
+    index("ix_user_status_room_id", "user_status", "room_id"),
+
+    "CREATE SEQUENCE IF NOT EXISTS room_stats_version_seq",
+    """
+    CREATE OR REPLACE FUNCTION room_stats_count_messages() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND NEW.room_id IS NOT DISTINCT FROM OLD.room_id THEN
+            UPDATE room_stats SET version = nextval('room_stats_version_seq')
+            WHERE room_id = NEW.room_id;
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.room_id IS NOT NULL THEN
+            INSERT INTO room_stats (room_id, message_count, last_message_id, last_message_at, version)
+            VALUES (NEW.room_id, 1, NEW.id, NEW.created_at, nextval('room_stats_version_seq'))
+            ON CONFLICT (room_id) DO UPDATE SET message_count = room_stats.message_count + 1,
+                                                last_message_id = CASE
+                                                    WHEN room_stats.last_message_at IS NULL
+                                                      OR EXCLUDED.last_message_at >= room_stats.last_message_at
+                                                    THEN EXCLUDED.last_message_id
+                                                    ELSE room_stats.last_message_id END,
+                                                last_message_at = GREATEST(room_stats.last_message_at,
+                                                                           EXCLUDED.last_message_at),
+                                                version = EXCLUDED.version;
+        END IF;
+        IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.room_id IS NOT NULL THEN
+            UPDATE room_stats SET message_count = GREATEST(message_count - 1, 0),
+                                  version = nextval('room_stats_version_seq')
+            WHERE room_id = OLD.room_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    trigger("trg_room_stats_count_messages", "chat_messages",
+            "AFTER INSERT OR DELETE OR UPDATE ON chat_messages "
+            "FOR EACH ROW EXECUTE FUNCTION room_stats_count_messages()"),
+    """
+    CREATE OR REPLACE FUNCTION room_stats_touch_room() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO room_stats (room_id, version) VALUES (NEW.id, nextval('room_stats_version_seq'))
+        ON CONFLICT (room_id) DO UPDATE SET version = EXCLUDED.version;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    trigger("trg_room_stats_touch_room", "rooms",
+            "AFTER INSERT OR UPDATE ON rooms "
+            "FOR EACH ROW EXECUTE FUNCTION room_stats_touch_room()"),
+    # The room directory inner joins room_stats, so every room needs a row. The trigger above inserts
+    # one for new rooms (creating it locks out concurrent inserts); this covers the rooms before it
+    """
+    INSERT INTO room_stats (room_id)
+    SELECT rooms.id FROM rooms
+    WHERE NOT EXISTS (SELECT 1 FROM room_stats WHERE room_stats.room_id = rooms.id)
+    ON CONFLICT (room_id) DO NOTHING
+    """,
+    """
+    CREATE OR REPLACE FUNCTION room_stats_touch_members() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND NEW.room_id IS NOT DISTINCT FROM OLD.room_id THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO room_stats (room_id, member_count)
+            VALUES (NEW.room_id, 1)
+            ON CONFLICT (room_id) DO UPDATE SET member_count = room_stats.member_count + 1;
+        END IF;
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE room_stats SET member_count = GREATEST(member_count - 1, 0)
+            WHERE room_id = OLD.room_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    trigger("trg_room_stats_touch_members", "user_status",
+            "AFTER INSERT OR DELETE OR UPDATE OF room_id ON user_status "
+            "FOR EACH ROW EXECUTE FUNCTION room_stats_touch_members()"),
+    # Nothing reads the old per-room member stamp
+    drop_column("room_stats", "member_version"),
+
+    # Message history embeds user cards, so its ETag also carries this stamp, bumped whenever a
+    # card field of any user changes (see ``get_room_version``)
+    "CREATE SEQUENCE IF NOT EXISTS user_cards_version_seq",
+    """
+    CREATE OR REPLACE FUNCTION user_cards_touch() RETURNS trigger AS $$
+    BEGIN
+        PERFORM nextval('user_cards_version_seq');
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    trigger("trg_user_cards_touch", "users",
+            "AFTER UPDATE OF user_name, full_name, avatar, verified ON users "
+            "FOR EACH STATEMENT EXECUTE FUNCTION user_cards_touch()"),
+]
+
+
+async def run_migrations(conn: AsyncConnection):
+    """
+    Apply the idempotent schema statements from ``MIGRATIONS`` in order.
+
+    Workers starting together take turns: the first applies what is missing while
+    the others wait on a transaction-level advisory lock, then find nothing to do.
+
+    Args:
+        conn (AsyncConnection): An open connection inside a transaction.
+    """
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": MIGRATIONS_LOCK_ID})
+    for statement in MIGRATIONS:
+        try:
+            await conn.execute(text(statement))
+        except Exception as e:
+            migrations_logger.error(f"Error applying migration {statement!r}: {e}")
+            raise
@@ -1,38 +1,14 @@
 
-<<<<<<< HEAD
-# from tkinter import CASCADE
-=======
-
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
-from sqlalchemy import JSON, Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import JSON, BigInteger, Column, Integer, String, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql.expression import text
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.orm import relationship
-<<<<<<< HEAD
-=======
 from sqlalchemy.dialects.postgresql import UUID
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 from app.database.database import Base
 
 
 
 
-<<<<<<< HEAD
-class Socket(Base):
-    __tablename__ = 'socket'
-    
-    id = Column(Integer, primary_key=True, nullable=False, index=True, autoincrement=True)
-    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
-    message = Column(String)
-    receiver_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'))
-    rooms = Column(String, ForeignKey('rooms.name_room', ondelete='CASCADE', onupdate='CASCADE'), nullable=False)
-    id_return = Column(Integer)
-    fileUrl = Column(String)
-    edited = Column(Boolean, server_default='false') 
-    return_message = Column(JSON, server_default=None)
-    delete = Column(Boolean, server_default='false')
-    
-=======
 class ChatMessages(Base):
     __tablename__ = 'chat_messages'
     
@@ -43,41 +19,26 @@ class ChatMessages(Base):
     voiceUrl = Column(String)
     videoUrl = Column(String)
     receiver_id = Column(UUID, ForeignKey('users.id', ondelete='SET NULL'))
-    rooms = Column(String, ForeignKey('rooms.name_room', ondelete='CASCADE', onupdate='CASCADE'), nullable=False)
     room_id = Column(UUID, ForeignKey('rooms.id', ondelete='CASCADE'))
     id_return = Column(UUID, nullable=True)
 
     edited = Column(Boolean, server_default='false') 
     return_message = Column(JSON, server_default=None)
     deleted = Column(Boolean, server_default='false')
+    vote_count = Column(Integer, nullable=False, server_default='0')
 
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     # Relationships
     reports = relationship("Report", back_populates="message")
     notifications = relationship("Notification", back_populates="message")
+
+    __table_args__ = (
+        # Keyset pagination of room history walks (created_at, id) backwards inside a room
+        Index('ix_chat_messages_room_id_created_at_id', 'room_id', text('created_at DESC'), text('id DESC')),
+    )
     
 class PrivateMessage(Base):
     __tablename__ = 'private_messages'
     
-<<<<<<< HEAD
-    id = Column(Integer, primary_key=True, nullable=False, index=True, autoincrement=True)
-    sender_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False, index=True)
-    receiver_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False, index=True)
-    message = Column(String)
-    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
-    is_read = Column(Boolean, nullable=False, default=True)
-    fileUrl = Column(String)
-    edited = Column(Boolean, server_default='false')
-    id_return = Column(Integer)
-    
-    
-    
-class Vote(Base):
-    __tablename__ = 'votes'
-    
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
-    message_id = Column(Integer, ForeignKey("socket.id", ondelete="CASCADE"), primary_key=True)
-=======
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('uuid_generate_v4()'), nullable=False)
     sender_id = Column(UUID, ForeignKey('users.id', ondelete="CASCADE"), nullable=False, index=True)
     receiver_id = Column(UUID, ForeignKey('users.id', ondelete="CASCADE"), nullable=False, index=True)
@@ -100,18 +61,53 @@ class ChatMessageVote(Base):
     
     user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     message_id = Column(UUID, ForeignKey("chat_messages.id", ondelete="CASCADE"), primary_key=True)
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     dir = Column(Integer)
     
     
 class PrivateMessageVote(Base):
     __tablename__ = 'private_message_votes'
     
-<<<<<<< HEAD
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
-    message_id = Column(Integer, ForeignKey("private_messages.id", ondelete="CASCADE"), primary_key=True)
-=======
     user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     message_id = Column(UUID, ForeignKey("private_messages.id", ondelete="CASCADE"), primary_key=True)
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
-    dir = Column(Integer) 
\ No newline at end of file
+    dir = Column(Integer)
+
+
+class RoomStats(Base):
+    """
+    Per-room counters and version stamps kept up to date by triggers on ``chat_messages``, ``rooms``
+    and ``user_status`` (see ``app.database.migrations``), so readers never have to ``count(*)`` a
+    room's history or re-render it to find out whether it changed.
+    """
+    __tablename__ = 'room_stats'
+
+    room_id = Column(UUID(as_uuid=True), ForeignKey('rooms.id', ondelete='CASCADE'), primary_key=True)
+    message_count = Column(BigInteger, nullable=False, server_default='0')
+    last_message_id = Column(UUID(as_uuid=True), nullable=True)
+    last_message_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    member_count = Column(BigInteger, nullable=False, server_default='0')
+    # Read by primary key only; left unindexed so the frequent updates of a room's row stay HOT
+    version = Column(BigInteger, nullable=False, server_default='0')
+
+    __table_args__ = (
+        # Keyset pages of the room directory sorted by messages or members
+        Index('ix_room_stats_message_count_room_id', text('message_count DESC'), text('room_id DESC')),
+        Index('ix_room_stats_member_count_room_id', text('member_count DESC'), text('room_id DESC')),
+    )
+
+
+class RoomReadMarker(Base):
+    """
+    How far a user has read a room: ``read_count`` is the room's message count at that point.
+    """
+    __tablename__ = 'room_read_markers'
+
+    id = Column(Integer, primary_key=True, nullable=False, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    room_id = Column(UUID(as_uuid=True), ForeignKey('rooms.id', ondelete='CASCADE'), nullable=False)
+    last_read_message_id = Column(UUID(as_uuid=True), nullable=True)
+    read_count = Column(BigInteger, nullable=False, server_default='0')
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'room_id', name='uq_room_read_markers_user_id_room_id'),
+    )
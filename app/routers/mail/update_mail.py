@@ -18,6 +18,7 @@ from app.models import user_model, password_model
 from app.config import utils, crypto_encrypto
 from app.config.config import settings
 from ...settings.get_info import get_user
+from app.settings.passwords import password_service
 
 update_logger = get_logger('update_mail', 'update_mail.log')
 
@@ -50,7 +51,7 @@ async def update_email(background_tasks: BackgroundTasks,
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                                 detail="User is not verified!")
 
-        if not utils.verify(password, current_user.password):
+        if not await password_service.verify(password, current_user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password."
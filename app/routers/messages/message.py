@@ -1,69 +1,238 @@
 
-from fastapi import status, HTTPException, Depends, APIRouter
-<<<<<<< HEAD
-
-
-from sqlalchemy import desc, func, and_
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import NoResultFound
-
-from app.auth import oauth2
-from app.database.async_db import get_async_session
-from app.models import user_model, room_model, messages_model
-from app.schemas import message
-=======
+import orjson
+from fastapi import status, HTTPException, Depends, APIRouter, Request
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, tuple_, union
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from _log_config.log_config import get_logger
 
 from app.auth import oauth2
-from app.database.async_db import get_async_session
-from app.models import user_model, messages_model
+from app.database.async_db import async_session_maker, get_async_session
+from app.models import user_model, messages_model, room_model
 from app.schemas import message
-from app.schemas.message import wrap_message
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
+from app.schemas.bulk import ListEncoder, json_response
 from sqlalchemy.future import select
-from typing import List
-
-from app.config.crypto_encrypto import async_decrypt
-<<<<<<< HEAD
+from typing import List, Optional
 
-=======
-from app.settings.get_info import get_room_by_id
+from app.cache.room_history import room_history_cache
+from app.cache.user_cards import user_card_cache
+from app.config.crypto_encrypto import async_decrypt_many
+from app.config.etag import etag_matches, make_etag, not_modified
+from app.settings.get_info import get_room_by_id, get_room_version, has_permission_to_the_room
+from app.settings.message_history import MESSAGE_PAGE_SIZE, HistoryLimit, reply_targets_query
 
 message_logger = get_logger('message', 'message.log')
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
+history_encoder = ListEncoder(message.WrappedSocketMessage)
+
+# Messages read, decrypted and written per chunk of a room export
+EXPORT_BATCH_SIZE = 1000
+
+UNKNOWN_USER_AVATAR = "https://media.giphy.com/media/9Y01tydkHUVvhxNVKR/giphy.gif?cid=ecf05e47xvp40pbs2k84kiq9qyo4h7c37yuixsylgd9l8c0h&ep=v1_gifs_search&rid=giphy.gif&ct=g"
 router = APIRouter(
     prefix="/messages",
     tags=['Message'],
 )
 
 
-<<<<<<< HEAD
-async def check_room_blocked(room_id: int, session: AsyncSession):
-    query = select(room_model.Rooms).where(room_model.Rooms.id == room_id, room_model.Rooms.block.is_(True))
+
+@router.get("/unread", response_model=List[message.RoomUnread])
+async def get_unread_counts(current_user: user_model.User = Depends(oauth2.get_current_user),
+                            session: AsyncSession = Depends(get_async_session)):
+    """
+    Returns the number of unread messages in every room the current user belongs to.
+
+    Counts come from the trigger-maintained ``room_stats`` counters and the user's read markers,
+    so the cost does not depend on how many messages the rooms hold.
+
+    Args:
+        current_user (User): The currently authenticated user.
+        session (AsyncSession, optional): Asynchronous database session. Defaults to Depends(get_async_session).
+
+    Returns:
+        List[RoomUnread]: One entry per room with its unread count and last read message.
+    """
     try:
-        result = await session.execute(query)
-        room_record = result.scalar_one()
-        return True
-    except NoResultFound:
-        return False
+        user_id = current_user.id
+        member_rooms = union(
+            select(messages_model.RoomReadMarker.room_id.label('room_id'))
+            .where(messages_model.RoomReadMarker.user_id == user_id),
+            select(room_model.Rooms.id).where(room_model.Rooms.owner == user_id),
+            select(room_model.RoleInRoom.room_id).where(room_model.RoleInRoom.user_id == user_id),
+            select(room_model.RoomsManagerMyRooms.room_id).where(room_model.RoomsManagerMyRooms.user_id == user_id),
+            select(room_model.RoomsManagerSecret.room_id).where(room_model.RoomsManagerSecret.user_id == user_id),
+        ).subquery()
+
+        unread = func.greatest(
+            func.coalesce(messages_model.RoomStats.message_count, 0)
+            - func.coalesce(messages_model.RoomReadMarker.read_count, 0), 0)
+
+        result = await session.execute(
+            select(member_rooms.c.room_id, unread.label('unread'),
+                   messages_model.RoomReadMarker.last_read_message_id)
+            .outerjoin(messages_model.RoomStats, messages_model.RoomStats.room_id == member_rooms.c.room_id)
+            .outerjoin(messages_model.RoomReadMarker,
+                       (messages_model.RoomReadMarker.room_id == member_rooms.c.room_id)
+                       & (messages_model.RoomReadMarker.user_id == user_id))
+        )
+        return [message.RoomUnread(room_id=room_id, unread=count, last_read_message_id=last_read)
+                for room_id, count, last_read in result.all()]
+    except Exception as e:
+        message_logger.error(f'Error occurred while fetching unread counts: {e}')
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
+
+
+@router.put("/{room_id}/read", response_model=message.RoomUnread)
+async def mark_room_read(room_id: UUID,
+                         marker: Optional[message.RoomReadMarkerUpdate] = None,
+                         current_user: user_model.User = Depends(oauth2.get_current_user),
+                         session: AsyncSession = Depends(get_async_session)):
+    """
+    Moves the current user's read marker in a room.
+
+    Args:
+        room_id (UUID): The ID of the room.
+        marker (RoomReadMarkerUpdate, optional): The last message the user has read. Without it the
+            whole room is marked as read.
+        current_user (User): The currently authenticated user.
+        session (AsyncSession, optional): Asynchronous database session. Defaults to Depends(get_async_session).
+
+    Returns:
+        RoomUnread: The room with its remaining unread count.
+    """
+    try:
+        existing_room = await get_room_by_id(room_id, session)
+        if existing_room is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+
+        total_query = await session.execute(
+            select(messages_model.RoomStats.message_count).where(messages_model.RoomStats.room_id == room_id))
+        total = total_query.scalar_one_or_none() or 0
+
+        page_key = tuple_(messages_model.ChatMessages.created_at, messages_model.ChatMessages.id)
+        if marker is not None and marker.message_id is not None:
+            cursor = await get_message_cursor(room_id, marker.message_id, session)
+            newer_query = await session.execute(
+                select(func.count()).where(messages_model.ChatMessages.room_id == room_id,
+                                           page_key > tuple_(*cursor)))
+            newer = newer_query.scalar()
+            last_read_message_id = marker.message_id
+        else:
+            head_query = await session.execute(
+                select(messages_model.ChatMessages.id)
+                .where(messages_model.ChatMessages.room_id == room_id)
+                .order_by(desc(messages_model.ChatMessages.created_at), desc(messages_model.ChatMessages.id))
+                .limit(1))
+            newer = 0
+            last_read_message_id = head_query.scalar_one_or_none()
+
+        read_count = max(total - newer, 0)
+        upsert = insert(messages_model.RoomReadMarker).values(
+            user_id=current_user.id,
+            room_id=room_id,
+            last_read_message_id=last_read_message_id,
+            read_count=read_count,
+        )
+        await session.execute(upsert.on_conflict_do_update(
+            constraint='uq_room_read_markers_user_id_room_id',
+            set_={'last_read_message_id': upsert.excluded.last_read_message_id,
+                  'read_count': upsert.excluded.read_count,
+                  'updated_at': func.now()},
+        ))
+        await session.commit()
+
+        return message.RoomUnread(room_id=room_id, unread=total - read_count,
+                                  last_read_message_id=last_read_message_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        message_logger.error(f'Error occurred while updating read marker: {e}')
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
+
+
+@router.get("/{room_id}/export")
+async def export_room_messages(room_id: UUID,
+                               current_user: user_model.User = Depends(oauth2.get_current_user),
+                               session: AsyncSession = Depends(get_async_session)):
+    """
+    Streams the whole history of a room as NDJSON, oldest first, one message per line.
+
+    Messages are read through a server-side cursor and decrypted batch by batch, so memory use does
+    not grow with the size of the room. Available to admins and the room owner.
+
+    Args:
+        room_id (UUID): The ID of the room.
+        current_user (User): The currently authenticated user.
+        session (AsyncSession, optional): Asynchronous database session. Defaults to Depends(get_async_session).
+
+    Returns:
+        StreamingResponse: ``application/x-ndjson`` attachment.
+    """
+    try:
+        existing_room = await get_room_by_id(room_id, session)
+        if existing_room is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Room not found")
+
+        if not await has_permission_to_the_room(current_user, existing_room):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    except HTTPException:
+        raise
+    except Exception as e:
+        message_logger.error(f'Error occurred while starting room export: {e}')
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
+
+    return StreamingResponse(stream_room_export(room_id),
+                             media_type="application/x-ndjson",
+                             headers={"Content-Disposition": f'attachment; filename="room-{room_id}.ndjson"'})
+
+
+async def stream_room_export(room_id: UUID, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yields NDJSON chunks of one batch of messages each.
+
+    The request's session is closed before a streaming body runs, so the export opens its own.
+    Plaintexts bypass the shared plaintext cache: an archive would only evict the hot entries.
+    """
+    chat_messages = messages_model.ChatMessages
+    query = (
+        select(chat_messages.id, chat_messages.created_at, chat_messages.receiver_id,
+               user_model.User.user_name, chat_messages.message, chat_messages.fileUrl,
+               chat_messages.voiceUrl, chat_messages.videoUrl, chat_messages.id_return,
+               chat_messages.edited, chat_messages.deleted, chat_messages.vote_count)
+        .outerjoin(user_model.User, chat_messages.receiver_id == user_model.User.id)
+        .where(chat_messages.room_id == room_id)
+        .order_by(chat_messages.created_at, chat_messages.id)
+        .execution_options(yield_per=batch_size)
+    )
+    exported = 0
+    try:
+        async with async_session_maker() as session:
+            result = await session.stream(query)
+            async for partition in result.partitions(batch_size):
+                decrypted_messages = await async_decrypt_many([row.message for row in partition], use_cache=False)
+                lines = []
+                for row, decrypted_message in zip(partition, decrypted_messages):
+                    record = row._asdict()
+                    record["message"] = decrypted_message
+                    lines.append(orjson.dumps(record))
+                exported += len(lines)
+                yield b"\n".join(lines) + b"\n"
+    except Exception as e:
+        message_logger.error(f'Room {room_id} export failed after {exported} messages: {e}')
+        raise
 
-@router.get("/{room_id}/{message_id}")
-async def get_count_message_room(room_id: int,
-                                 message_id: int, 
-=======
 
 @router.get("/{room_id}/{message_id}")
 async def get_count_message_room(room_id: UUID,
                                  message_id: UUID,
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
                                  session: AsyncSession = Depends(get_async_session)):
     """
     Retrieves the count of messages in a specific room that have an ID greater than a given message ID.
 
+    Prefer ``GET /messages/unread``, which answers for all of the user's rooms from maintained counters.
+
     Args:
         room_id (int): The ID of the room.
         message_id (int): The ID of the message.
@@ -72,45 +241,6 @@ async def get_count_message_room(room_id: UUID,
     Returns:
         int: The count of messages in the room that have an ID greater than the given message ID.
     """
-<<<<<<< HEAD
-    get_room_and_message = (
-        select(room_model.Rooms.name_room, messages_model.Socket.id)
-        .join(messages_model.Socket, 
-              and_(
-                  room_model.Rooms.name_room == messages_model.Socket.rooms,
-                  messages_model.Socket.id == message_id
-              ), isouter=True)
-        .where(room_model.Rooms.id == room_id)
-    )
-    result = await session.execute(get_room_and_message)
-    room_message_data = result.first()
-    
-    if room_message_data is None or room_message_data[0] is None:
-        raise HTTPException(status_code=404, detail="Room not found")
-    
-    name_room, message_id_check = room_message_data
-
-    if message_id_check is None:
-        return 0
-
-    count_query = (
-        select(func.count())
-        .select_from(messages_model.Socket)
-        .where(
-            and_(
-                messages_model.Socket.rooms == name_room,
-                messages_model.Socket.id > message_id
-            )
-        )
-    )
-    result = await session.execute(count_query)
-    count_messages_after = result.scalar()
-    return count_messages_after
-
-
-@router.get("/message_id")
-async def fetch_message_by_id(message_id: int,
-=======
     try:
         message_date = await session.execute(select(messages_model.ChatMessages.created_at)
             .where(messages_model.ChatMessages.id == message_id, messages_model.ChatMessages.room_id == room_id)
@@ -136,10 +266,10 @@ async def fetch_message_by_id(message_id: int,
 
 @router.get("/message_id")
 async def fetch_message_by_id(message_id: UUID,
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
                               session: AsyncSession = Depends(get_async_session)):
     """
     Fetches a message by its ID along with user information and returns it as a SocketReturnMessage object.
+    To resolve many messages at once use ``POST /messages/batch``.
 
     Parameters:
     session (AsyncSession): The database session to use for querying the database.
@@ -148,174 +278,106 @@ async def fetch_message_by_id(message_id: UUID,
     Returns:
     Optional[SocketReturnMessage]: A SocketReturnMessage object representing the message, or None if no message is found.
     """
-    # Formulate the query
-<<<<<<< HEAD
-    message_query = select(
-        messages_model.Socket, 
-        user_model.User
-    ).outerjoin(
-        user_model.User, messages_model.Socket.receiver_id == user_model.User.id
-
-    ).filter(
-        messages_model.Socket.id == message_id
-    ).group_by(
-        messages_model.Socket.id, user_model.User.id
-    )
-
-    # Execute the query
-    result = await session.execute(message_query)
-    message_data = result.first()
+    try:
+        found = await get_messages_by_ids([message_id], session)
+        return found[0] if found else None
+    except Exception as e:
+        message_logger.error(f'Error occurred while fetching message by ID: {e}')
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
 
-    if message_data:
-        socket, user = message_data
-        decrypted_message = await async_decrypt(socket.message) if socket.message else None
 
-        # Create a SocketReturnMessage instance
-        return_message = message.SocketReturnMessage(
-            created_at=socket.created_at,
-            receiver_id=socket.receiver_id,
-            id=socket.id,
-            message=decrypted_message,
-            fileUrl=socket.fileUrl,
-            user_name=user.user_name if user else "USER DELETE",
-            avatar=user.avatar if user else "https://tygjaceleczftbswxxei.supabase.co/storage/v1/object/public/image_bucket/inne/image/boy_1.webp",
-            delete=socket.delete
-        )
+@router.post("/batch", response_model=List[message.ChatReturnMessage])
+async def fetch_messages_batch(batch: message.ChatMessageBatch,
+                               session: AsyncSession = Depends(get_async_session)):
+    """
+    Fetches several messages by ID at once, e.g. all reply targets (``id_return``) of a page.
 
-        return return_message
+    Args:
+        batch (ChatMessageBatch): Up to ``MESSAGE_BATCH_LIMIT`` message IDs.
+        session (AsyncSession, optional): Asynchronous database session. Defaults to Depends(get_async_session).
 
-    else:
-        return None
-=======
+    Returns:
+        List[ChatReturnMessage]: The messages that exist, in the order they were requested.
+    """
     try:
-        message_query = select(
-            messages_model.ChatMessages,
-            user_model.User
-        ).outerjoin(
-            user_model.User, messages_model.ChatMessages.receiver_id == user_model.User.id
-
-        ).filter(
-            messages_model.ChatMessages.id == message_id
-        ).group_by(
-            messages_model.ChatMessages.id, user_model.User.id
-        )
+        return await get_messages_by_ids(batch.ids, session)
+    except Exception as e:
+        message_logger.error(f'Error occurred while fetching message batch: {e}')
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
 
-        # Execute the query
-        result = await session.execute(message_query)
-        message_data = result.first()
-
-        if message_data:
-            messages, user = message_data
-            decrypted_message = await async_decrypt(messages.message) if messages.message else None
-
-            # Create a SocketReturnMessage instance
-            return_message = message.ChatReturnMessage(
-                created_at=messages.created_at,
-                receiver_id=messages.receiver_id,
-                id=messages.id,
-                message=decrypted_message,
-                fileUrl=messages.fileUrl,
-                voiceUrl=messages.voiceUrl,
-                videoUrl=messages.videoUrl,
-                user_name=user.user_name if user else "Unknown user",
-                avatar=user.avatar if user else "https://media.giphy.com/media/9Y01tydkHUVvhxNVKR/giphy.gif?cid=ecf05e47xvp40pbs2k84kiq9qyo4h7c37yuixsylgd9l8c0h&ep=v1_gifs_search&rid=giphy.gif&ct=g",
-                deleted=messages.deleted,
-                room_id=messages.room_id
-            )
 
-            return return_message
+async def get_messages_by_ids(message_ids: List[UUID], session: AsyncSession) -> List[message.ChatReturnMessage]:
+    """
+    Loads messages with one query, one user-card lookup and one batched decrypt.
 
-        else:
-            return None
-    except Exception as e:
-        message_logger.error(f'Error occurred while fetching message by ID: {e}')
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
+    Returns:
+        List[ChatReturnMessage]: The messages found, in the order of ``message_ids``; unknown IDs are skipped.
+    """
+    result = await session.execute(
+        select(messages_model.ChatMessages).where(messages_model.ChatMessages.id.in_(set(message_ids)))
+    )
+    found = {chat_message.id: chat_message for chat_message in result.scalars().all()}
+    ordered = [found[message_id] for message_id in dict.fromkeys(message_ids) if message_id in found]
+
+    decrypted_messages = await async_decrypt_many([chat_message.message for chat_message in ordered])
+    users = await user_card_cache.get_many([chat_message.receiver_id for chat_message in ordered], session)
+
+    return_messages = []
+    for chat_message, decrypted_message in zip(ordered, decrypted_messages):
+        user = users.get(chat_message.receiver_id)
+        return_messages.append(message.ChatReturnMessage(
+            created_at=chat_message.created_at,
+            receiver_id=chat_message.receiver_id,
+            id=chat_message.id,
+            message=decrypted_message,
+            fileUrl=chat_message.fileUrl,
+            voiceUrl=chat_message.voiceUrl,
+            videoUrl=chat_message.videoUrl,
+            user_name=user.user_name if user else "Unknown user",
+            avatar=user.avatar if user else UNKNOWN_USER_AVATAR,
+            deleted=chat_message.deleted,
+            room_id=chat_message.room_id
+        ))
+    return return_messages
 
 
 
 
-<<<<<<< HEAD
-@router.get("/{room_id}", response_model=List[message.SocketModel])
-async def get_messages_room(room_id: int, 
-=======
-@router.get("/{room_id}")
+@router.get("/{room_id}", response_model=List[message.WrappedSocketMessage])
 async def get_messages_room(room_id: UUID,
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
+                            request: Request,
                             session: AsyncSession = Depends(get_async_session), 
-                            limit: int = 50, skip: int = 0):
+                            limit: HistoryLimit = MESSAGE_PAGE_SIZE,
+                            before: Optional[UUID] = None,
+                            after: Optional[UUID] = None):
     """
-    Retrieves a list of socket messages with associated user details, paginated by a limit and offset.
+    Retrieves a page of room messages with associated user details, newest first.
+
+    Pages are addressed with keyset cursors on ``(created_at, id)`` instead of an offset, so every
+    page is a range scan of the ``(room_id, created_at, id)`` index no matter how deep the history is.
+    The newest page is served from ``room_history_cache`` when possible. Replies carry a ``reply`` preview
+    of the quoted message, so clients do not have to fetch ``id_return`` separately.
+
+    Responses carry a strong ``ETag`` built from the room's and the user cards' version stamps; a request whose
+    ``If-None-Match`` still matches gets ``304 Not Modified`` after a single primary-key lookup.
 
     Args:
-<<<<<<< HEAD
-        rooms (str): The rooms of the message.
-=======
-        room_id (str): The rooms of the message.
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
+        room_id (UUID): The ID of the room.
+        request (Request): The incoming request, read for ``If-None-Match``.
         session (AsyncSession, optional): Asynchronous database session. Defaults to Depends(get_async_session).
-        limit (int, optional): Maximum number of messages to retrieve. Defaults to 50.
-        skip (int, optional): Number of messages to skip for pagination. Defaults to 0.
+        limit (int, optional): Maximum number of messages to retrieve, 1 to 200. Defaults to 50.
+        before (UUID, optional): ID of the oldest message the client already has; returns the page older than it.
+        after (UUID, optional): ID of the newest message the client already has; returns the page newer than it.
 
     Returns:
-        List[schemas.SocketModel]: A list of socket messages along with user details, structured as per SocketModel schema.
+        List[WrappedSocketMessage]: A list of messages along with user details, ordered from newest to oldest.
     """
-<<<<<<< HEAD
-    room_blocked = await check_room_blocked(room_id, session)  
-    if room_blocked:
-        raise HTTPException(status_code=403, detail="Room is blocked")
-    
-    room = select(room_model.Rooms).where(room_model.Rooms.id == room_id)
-    result = await session.execute(room)
-    existing_room = result.scalar_one_or_none()
-    if existing_room is None:
-        raise HTTPException(status_code=404, detail="Room not found")
-    
-    
-    query = select(
-    messages_model.Socket, 
-    user_model.User, 
-    func.coalesce(func.sum(messages_model.Vote.dir), 0).label('votes')
-    ).outerjoin(
-        messages_model.Vote, messages_model.Socket.id == messages_model.Vote.message_id
-    ).outerjoin( 
-        user_model.User, messages_model.Socket.receiver_id == user_model.User.id
-    ).filter(
-        messages_model.Socket.rooms == existing_room.name_room
-    ).group_by(
-        messages_model.Socket.id, user_model.User.id
-    ).order_by(
-        desc(messages_model.Socket.created_at)
-    )
-
-    result = await session.execute(query)
-    raw_messages = result.all()
-
-    # Convert raw messages to SocketModel
-    messages = []
-    for socket, user, votes in raw_messages:
-        decrypted_message = await async_decrypt(socket.message)
-        messages.append(
-            message.SocketModel(
-                created_at=socket.created_at,
-                receiver_id=socket.receiver_id,
-                message=decrypted_message,
-                fileUrl=socket.fileUrl,
-                user_name=user.user_name if user is not None else "Unknown user",
-                avatar=user.avatar if user is not None else "https://tygjaceleczftbswxxei.supabase.co/storage/v1/object/public/image_bucket/inne/image/photo_2024-06-14_19-20-40.jpg",
-                verified=user.verified if user is not None else None,
-                id=socket.id,
-                vote=votes,
-                id_return=socket.id_return,
-                edited=socket.edited,
-                return_message=socket.return_message
-            )
-        )
-    messages.reverse()
-    return messages
-=======
+    if before is not None and after is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Use either 'before' or 'after', not both")
+    first_page = before is None and after is None and room_history_cache.covers(limit)
     try:
-        existing_room = await get_room_by_id(room_id, session)
+        existing_room = await get_room_version(room_id, session)
         if existing_room is None:
             raise HTTPException(status_code=404, detail="Room not found")
 
@@ -323,79 +385,128 @@ async def get_messages_room(room_id: UUID,
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                                 detail="Room is blocked")
 
+        etag = make_etag("messages", room_id, existing_room.version, existing_room.card_version, limit, before, after)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        headers = {"ETag": etag}
 
-        query = await session.execute(select(
-        messages_model.ChatMessages,
-        user_model.User,
-        func.coalesce(func.sum(messages_model.ChatMessageVote.dir), 0).label('votes')
-        ).outerjoin(
-            messages_model.ChatMessageVote, messages_model.ChatMessages.id == messages_model.ChatMessageVote.message_id
-        ).outerjoin(
-            user_model.User, messages_model.ChatMessages.receiver_id == user_model.User.id
-        ).filter(
-            messages_model.ChatMessages.room_id == existing_room.id
-        ).group_by(
-            messages_model.ChatMessages.id, user_model.User.id
-        ).order_by(
-            desc(messages_model.ChatMessages.created_at)
-        ).limit(limit))
-
-        raw_messages = query.all()
-
-        # Convert raw messages to ChatMessagesSchema
-
-        wrapped_messages = []
-        for messages, user, votes in raw_messages:
-            decrypted_message = await async_decrypt(messages.message)
-            socket_model = message.ChatMessagesSchema(
-                created_at=messages.created_at,
-                receiver_id=messages.receiver_id,
-                message=decrypted_message,
-                fileUrl=messages.fileUrl,
-                voiceUrl=messages.voiceUrl,
-                videoUrl=messages.voiceUrl,
-                user_name=user.user_name if user is not None else "Unknown user",
-                avatar=user.avatar if user is not None else "https://media.giphy.com/media/9Y01tydkHUVvhxNVKR/giphy.gif?cid=ecf05e47xvp40pbs2k84kiq9qyo4h7c37yuixsylgd9l8c0h&ep=v1_gifs_search&rid=giphy.gif&ct=g",
-                verified=user.verified,
-                id=messages.id,
-                vote=votes,
-                id_return=messages.id_return,
-                edited=messages.edited,
-                deleted=messages.deleted,
-                room_id=messages.room_id
-            )
-            wrapped_message = await wrap_message(socket_model)
-            wrapped_messages.append(wrapped_message)
+        if first_page:
+            cached_messages = await room_history_cache.get(room_id, limit, existing_room.version,
+                                                           existing_room.card_version)
+            if cached_messages is not None:
+                return json_response(cached_messages, headers=headers)
+
+        page_key = tuple_(messages_model.ChatMessages.created_at, messages_model.ChatMessages.id)
 
-        return wrapped_messages
+        query = select(messages_model.ChatMessages).filter(
+            messages_model.ChatMessages.room_id == room_id
+        )
+
+        if after is not None:
+            cursor = await get_message_cursor(room_id, after, session)
+            query = query.filter(page_key > tuple_(*cursor)).order_by(
+                messages_model.ChatMessages.created_at, messages_model.ChatMessages.id)
+        else:
+            if before is not None:
+                cursor = await get_message_cursor(room_id, before, session)
+                query = query.filter(page_key < tuple_(*cursor))
+            query = query.order_by(
+                desc(messages_model.ChatMessages.created_at), desc(messages_model.ChatMessages.id))
+
+        # Read a full cache entry for the newest page, even if the client asked for fewer
+        result = await session.execute(query.limit(room_history_cache.size if first_page else limit))
+        raw_messages = result.scalars().all()
+
+        # Pages after a cursor are read oldest first; keep the response newest first
+        if after is not None:
+            raw_messages.reverse()
+
+        # Reply targets that are not on this page are read in one extra query. ``id_return`` is set by
+        # clients, so only messages of this room are previewed
+        page_ids = {messages.id for messages in raw_messages}
+        reply_ids = {messages.id_return for messages in raw_messages if messages.id_return is not None} - page_ids
+        reply_targets = []
+        if reply_ids:
+            reply_result = await session.execute(reply_targets_query(room_id, reply_ids))
+            reply_targets = reply_result.scalars().all()
+
+        # Decrypt the page and its reply targets at once, off the event loop
+        decrypted = await async_decrypt_many([messages.message for messages in raw_messages]
+                                             + [target.message for target in reply_targets])
+        decrypted_messages = decrypted[:len(raw_messages)]
+        users = await user_card_cache.get_many([messages.receiver_id for messages in raw_messages]
+                                               + [target.receiver_id for target in reply_targets], session)
+
+        previews = {}
+        for target, decrypted_message in zip([*raw_messages, *reply_targets], decrypted):
+            author = users.get(target.receiver_id)
+            previews[target.id] = {
+                "id": target.id,
+                "message": decrypted_message,
+                "receiver_id": target.receiver_id,
+                "user_name": author.user_name if author is not None else "Unknown user",
+                "deleted": target.deleted,
+            }
+
+        # Build plain rows and let history_encoder validate and serialize the page in one call
+        rows = []
+        for messages, decrypted_message in zip(raw_messages, decrypted_messages):
+            user = users.get(messages.receiver_id)
+            rows.append({"message": {
+                "created_at": messages.created_at,
+                "receiver_id": messages.receiver_id,
+                "message": decrypted_message,
+                "fileUrl": messages.fileUrl,
+                "voiceUrl": messages.voiceUrl,
+                "videoUrl": messages.videoUrl,
+                "user_name": user.user_name if user is not None else "Unknown user",
+                "avatar": user.avatar if user is not None else UNKNOWN_USER_AVATAR,
+                "verified": user.verified if user is not None else None,
+                "id": messages.id,
+                "vote": messages.vote_count,
+                "id_return": messages.id_return,
+                "edited": messages.edited,
+                "deleted": messages.deleted,
+                "room_id": messages.room_id,
+                "reply": previews.get(messages.id_return) if messages.id_return is not None else None
+            }})
+
+        if first_page:
+            wrapped_messages = history_encoder.to_jsonable(rows)
+            await room_history_cache.put(room_id, wrapped_messages, existing_room.version,
+                                         existing_room.card_version)
+            return json_response(wrapped_messages[:limit], headers=headers)
+
+        return history_encoder.response(rows, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         message_logger.error(f'Error occurred while fetching messages: {e}')
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
 
+async def get_message_cursor(room_id: UUID, message_id: UUID, session: AsyncSession):
+    """
+    Resolves a message ID used as a page cursor into its ``(created_at, id)`` key.
 
+    Raises:
+        HTTPException: 404 if the message does not exist in the given room.
+    """
+    cursor_query = await session.execute(
+        select(messages_model.ChatMessages.created_at, messages_model.ChatMessages.id)
+        .where(messages_model.ChatMessages.id == message_id,
+               messages_model.ChatMessages.room_id == room_id)
+    )
+    cursor = cursor_query.first()
+    if cursor is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"Message {message_id} not found in room {room_id}")
+    return cursor
 
-@router.put("/{id}", include_in_schema=False)
-<<<<<<< HEAD
-async def change_message(id_message: int, message_update: message.SocketUpdate,
-                         current_user: user_model.User = Depends(oauth2.get_current_user), 
-                         session: AsyncSession = Depends(get_async_session)):
-    
-    
-    query = select(messages_model.Socket).where(messages_model.Socket.id == id_message, messages_model.Socket.receiver_id == current_user.id)
-    result = await session.execute(query)
-    message = result.scalar()
 
-    if message is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found or you don't have permission to edit this message")
 
-    message.message = message_update.message
-    session.add(message)
-    await session.commit()
 
-    return {"message": "Message updated successfully"}
-=======
+@router.put("/{id}", include_in_schema=False)
 async def change_message(id_message: UUID, message_update: message.ChatUpdateMessage,
                          current_user: user_model.User = Depends(oauth2.get_current_user), 
                          session: AsyncSession = Depends(get_async_session)):
@@ -409,24 +520,22 @@ async def change_message(id_message: UUID, message_update: message.ChatUpdateMes
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found or you don't have permission to edit this message")
 
         messages.message = message_update.message
-        session.add(message)
+        session.add(messages)
         await session.commit()
+        await room_history_cache.invalidate(messages.room_id)
 
         return {"message": "Message updated successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         message_logger.error(f'Error occurred while updating message: {e}')
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     
 
 
 # Old functions
 
-<<<<<<< HEAD
-@router.get("/", response_model=List[message.SocketModel], include_in_schema=False)
-=======
 @router.get("/", response_model=List[message.ChatMessagesSchema], include_in_schema=False)
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 async def get_posts(session: AsyncSession = Depends(get_async_session), 
                     limit: int = 50, skip: int = 0):
     
@@ -441,61 +550,12 @@ async def get_posts(session: AsyncSession = Depends(get_async_session),
     Returns:
         List[schemas.SocketModel]: A list of socket messages along with user details, structured as per SocketModel schema.
     """
-<<<<<<< HEAD
-
-    query = select(
-        messages_model.Socket, 
-        user_model.User, 
-        func.coalesce(func.sum(messages_model.Vote.dir), 0).label('votes')
-    ).outerjoin(
-        messages_model.Vote, messages_model.Socket.id == messages_model.Vote.message_id
-    ).join(
-        user_model.User, messages_model.Socket.receiver_id == user_model.User.id
-    ).group_by(
-        messages_model.Socket.id, user_model.User.id
-    ).order_by(
-        desc(messages_model.Socket.created_at)
-    ).limit(50)
-
-    result = await session.execute(query)
-    raw_messages = result.all()
-
-    result = await session.execute(query)
-    raw_messages = result.all()
-
-    # Convert raw messages to SocketModel
-    messages = []
-    for socket, user, votes in raw_messages:
-        decrypted_message = await async_decrypt(socket.message)
-        messages.append(
-            message.SocketModel(
-                created_at=socket.created_at,
-                receiver_id=socket.receiver_id,
-                message=decrypted_message,
-                fileUrl=socket.fileUrl,
-                user_name=user.user_name if user is not None else "Unknown user",
-                avatar=user.avatar if user is not None else "https://tygjaceleczftbswxxei.supabase.co/storage/v1/object/public/image_bucket/inne/image/photo_2024-06-14_19-20-40.jpg",
-                verified=user.verified if user is not None else None,
-                id=socket.id,
-                vote=votes,
-                id_return=socket.id_return,
-                edited=socket.edited
-            )
-        )
-    messages.reverse()
-    return messages
-=======
     try:
         query = select(
             messages_model.ChatMessages,
-            user_model.User,
-            func.coalesce(func.sum(messages_model.ChatMessageVote.dir), 0).label('votes')
-        ).outerjoin(
-            messages_model.ChatMessageVote, messages_model.ChatMessages.id == messages_model.ChatMessageVote.message_id
+            user_model.User
         ).join(
             user_model.User, messages_model.ChatMessages.receiver_id == user_model.User.id
-        ).group_by(
-            messages_model.ChatMessages.id, user_model.User.id
         ).order_by(
             desc(messages_model.ChatMessages.created_at)
         ).limit(50)
@@ -503,28 +563,26 @@ async def get_posts(session: AsyncSession = Depends(get_async_session),
         result = await session.execute(query)
         raw_messages = result.all()
 
-        result = await session.execute(query)
-        raw_messages = result.all()
+        decrypted_messages = await async_decrypt_many([chat_message.message for chat_message, _ in raw_messages])
 
         # Convert raw messages to SocketModel
         messages = []
-        for messages, user, votes in raw_messages:
-            decrypted_message = await async_decrypt(messages.message)
+        for (chat_message, user), decrypted_message in zip(raw_messages, decrypted_messages):
             messages.append(
-                messages.ChatMessagesSchema(
-                    created_at=messages.created_at,
-                    receiver_id=messages.receiver_id,
+                message.ChatMessagesSchema(
+                    created_at=chat_message.created_at,
+                    receiver_id=chat_message.receiver_id,
                     message=decrypted_message,
-                    fileUrl=messages.fileUrl,
+                    fileUrl=chat_message.fileUrl,
                     user_name=user.user_name if user is not None else "Unknown user",
                     avatar=user.avatar if user is not None else "https://tygjaceleczftbswxxei.supabase.co/storage/v1/object/public/image_bucket/inne/image/photo_2024-06-14_19-20-40.jpg",
                     verified=user.verified if user is not None else None,
-                    id=messages.id,
-                    vote=votes,
-                    id_return=messages.id_return,
-                    edited=messages.edited,
-                    deleted=messages.deleted,
-                    room_id=messages.room_id
+                    id=chat_message.id,
+                    vote=chat_message.vote_count,
+                    id_return=chat_message.id_return,
+                    edited=chat_message.edited,
+                    deleted=chat_message.deleted,
+                    room_id=chat_message.room_id
                 )
             )
         messages.reverse()
@@ -532,4 +590,3 @@ async def get_posts(session: AsyncSession = Depends(get_async_session),
     except Exception as e:
         message_logger.error(f'Error occurred while fetching messages: {e}')
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Internal Server Error')
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
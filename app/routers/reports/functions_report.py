@@ -1,122 +1,7 @@
-<<<<<<< HEAD
-
-
-from sqlalchemy.future import select
-from sqlalchemy import or_
-from app.models import reports_model, room_model, messages_model
-from app.schemas import report
-   
-from app.config.crypto_encrypto import async_decrypt  
-
-    
-async def check_message_id(db, message_id):
-    
-    check_message = select(messages_model.Socket).where(messages_model.Socket.id == message_id)
-    result = await db.execute(check_message)
-    message = result.scalar_one_or_none()
-    return message is not None
-
-async def add_report_message(db, report_data, user_id):
-    
-    new_report = reports_model.Report(
-        message_id=report_data.message_id,
-        reported_by_user_id=user_id,
-        reason=report_data.reason,
-        additional_info=report_data.additional_info
-    )
-    db.add(new_report)
-    await db.commit()
-    await db.refresh(new_report)
-    return new_report
-
-
-
-async def get_all_moderators_in_room(db, room_id):
-    
-    role_in_room = select(room_model.RoleInRoom).where(
-        room_model.RoleInRoom.room_id == room_id
-    ).where(
-        or_(room_model.RoleInRoom.role == "moderator", room_model.RoleInRoom.role == "owner")
-    )
-    result = await db.execute(role_in_room)
-    moderators = result.scalars().all()
-    
-    return moderators
-
-async def get_message(db, message_id):
-    
-    check_message = select(messages_model.Socket).where(messages_model.Socket.id == message_id)
-    result = await db.execute(check_message)
-    message = result.scalar_one_or_none()
-    return message
-
-async def get_room_id(db, message_id):
-    message = await get_message(db, message_id)
-    
-    if not message:
-        return None
-    
-    room_query = select(room_model.Rooms.id).where(room_model.Rooms.name_room == message.rooms)
-    result = await db.execute(room_query)
-    room = result.scalar_one_or_none()
-    return room
-
-
-async def send_notification_to_moderators(db, room_id, message_id, report_id):
-    
-    moderators = await get_all_moderators_in_room(db, room_id)
-    for moderator in moderators:
-        notification = reports_model.Notification(
-            room_id=room_id,
-            message_id=message_id,
-            moderator_id=moderator.user_id,
-            seen=False,
-            report_id=report_id
-        )
-        db.add(notification)
-    await db.commit()
-    
-    
-async def get_reports(db, user_id):
-    get_notifications_query = select(reports_model.Notification).where(reports_model.Notification.moderator_id == user_id)
-    result = await db.execute(get_notifications_query)
-    notifications = result.scalars().all()
-
-    report_notifications = []
- 
-    for notification in notifications:
-        message = await get_message(db, notification.message_id)
-        decript_message = await async_decrypt(message.message)
-        get_reports_query = select(reports_model.Report).where(reports_model.Report.id == notification.report_id)
-        result = await db.execute(get_reports_query)
-        report_records = result.scalars().all()
-
-        for report_record in report_records:
-            
-            report_notification = report.ReportsGetNotification(
-                report_id=report_record.id,
-                reporter_by_user_id=report_record.reported_by_user_id,
-                message_id=report_record.message_id,
-                message=decript_message,
-                room_id=notification.room_id,
-                room=message.rooms,
-                reason=report_record.reason,
-                additional_info=report_record.additional_info,
-                status=report_record.status,
-                seen=notification.seen,
-                created_at=report_record.created_at
-            )
-
-            report_notifications.append(report_notification)
-    
-    return report_notifications
-
-
-
-=======
 from sqlalchemy.future import select
 from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache.room_meta import room_meta_cache
 from app.models import reports_model, room_model, messages_model
 from app.schemas import report
 from uuid import UUID
@@ -188,16 +73,10 @@ async def get_message(message_id: UUID, db: AsyncSession):
 
 async def get_room_id(message_id: UUID, db: AsyncSession):
     try:
-        message = await get_message(message_id, db)
-
-        if not message:
-            return None
-
-        room_query = await db.execute(select(room_model.Rooms.id).where(
-            room_model.Rooms.name_room == message.rooms
+        room_query = await db.execute(select(messages_model.ChatMessages.room_id).where(
+            messages_model.ChatMessages.id == message_id
         ))
-        room = room_query.scalar_one_or_none()
-        return room
+        return room_query.scalar_one_or_none()
     except Exception as e:
         func_report_logger.error(f"Error getting room id: {e}")
         raise
@@ -234,6 +113,7 @@ async def get_reports(user_id: UUID, db: AsyncSession):
         for notification in notifications:
             message = await get_message(notification.message_id, db)
             decrypt_message = await async_decrypt(message.message)
+            room = await room_meta_cache.get(message.room_id, db)
             get_reports_query = await db.execute(select(reports_model.Report).where(
                 reports_model.Report.id == notification.report_id
             ))
@@ -246,7 +126,7 @@ async def get_reports(user_id: UUID, db: AsyncSession):
                     message_id=report_record.message_id,
                     message=decrypt_message,
                     room_id=notification.room_id,
-                    room=message.rooms,
+                    room=room.name_room if room else "",
                     reason=report_record.reason,
                     additional_info=report_record.additional_info,
                     status=report_record.status,
@@ -260,4 +140,3 @@ async def get_reports(user_id: UUID, db: AsyncSession):
     except Exception as e:
         func_report_logger.error(f"Error getting reports: {e}")
         raise
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
@@ -6,9 +6,11 @@ import pytz
 from datetime import datetime, timedelta
 
 from app.models import user_model, password_model
+from app.cache.principals import principal_cache
 from app.schemas.reset import PasswordResetRequest, PasswordResetMobile, PasswordResetV2
 
 from app.config import utils
+from app.settings.passwords import password_service
 from app.mail.send_mail import password_reset_mobile
 from app.database.async_db import get_async_session
 
@@ -88,16 +90,14 @@ async def reset_password(reset: PasswordResetMobile, db: AsyncSession = Depends(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f"Code reset not active")
     
-<<<<<<< HEAD
-    stmt_update = update(user_model.User).where(user_model.User.email == reset.email).values(password=utils.hash_password(
-=======
-    stmt_update = update(user_model.User).where(user_model.User.email == reset.email).values(password=utils.hash(
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
-        reset.password),
+    hashed_password = await password_service.hash(reset.password)
+    stmt_update = update(user_model.User).where(user_model.User.email == reset.email).values(password=hashed_password,
                                                                                              blocked=False,
-                                                                                             password_changed=current_time_utc)
+                                                                                             password_changed=current_time_utc).returning(user_model.User.id)
     result = await db.execute(stmt_update)
     await db.commit()
+    for user_id in result.scalars().all():
+        await principal_cache.invalidate(user_id)
     
     stmt_delete = delete(password_model.PasswordReset).where(password_model.PasswordReset.email == reset.email)
     result = await db.execute(stmt_delete)
@@ -10,7 +10,7 @@ from app.models import user_model, room_model
 from app.schemas import user as user_schema
 from app.schemas import room as schema_room
 from app.config.start_schema import start_app
-from app.settings.get_info import get_count_messages, get_count_users
+from app.settings.room_cards import assemble_room_cards, room_cards_query
 
 
 logger = get_logger('func_finds', 'func_search.log')
@@ -47,34 +47,13 @@ async def get_search_users(pattern: str, db: AsyncSession):
 
 async def get_search_rooms(pattern: str, db: AsyncSession):
     try:
-        room_query =  await db.execute(select(room_model.Rooms).where(
+        room_query =  await db.execute(room_cards_query().where(
             room_model.Rooms.name_room != hell,
             room_model.Rooms.secret_room == False,
             func.lower(room_model.Rooms.name_room).like(pattern),
             ))
-        rooms = room_query.scalars().all()
-
-        # Count messages for room
-        messages_count = await get_count_messages(db)
-
-        # Count users for room
-        users_count = await get_count_users(db)
-
-        rooms_info_list = []
-        for room in rooms:
-            room_info = schema_room.RoomBase(
-                id=room.id,
-                owner=room.owner,
-                name_room=room.name_room,
-                image_room=room.image_room,
-                count_users=next((uc.count for uc in users_count if uc.name_room == room.name_room), 0),
-                count_messages=next((mc.count for mc in messages_count if mc.rooms == room.name_room), 0),
-                created_at= room.created_at,
-                secret_room=room.secret_room
-            )
-            rooms_info_list.append(room_info)
 
-        return rooms_info_list
+        return [schema_room.RoomBase(**card) for card in assemble_room_cards(room_query.all())]
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -8,15 +8,17 @@ from sqlalchemy import func
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth import oauth2
+from app.auth.principal import Principal
 from app.config.start_schema import start_app
 
 from app.database.async_db import get_async_session
 
-from app.models import user_model, room_model
+from app.models import room_model
 from app.schemas import room as room_schema
 
 from .get_tabs_info import get_tabs_user, get_one_tab_user, get_room_tab, get_favorite_record, get_room_tab_id
-from app.settings.get_info import get_count_users, get_count_messages, get_room_by_id
+from app.settings.get_info import get_room_by_id
+from app.settings.room_cards import get_favorite_room_cards, get_room_cards
 
 logger = get_logger('tabs_rooms', 'tabs_rooms.log')
 router = APIRouter(
@@ -28,14 +30,14 @@ router = APIRouter(
 @router.post('/')
 async def create_user_tab(tab: room_schema.RoomTabsCreate, 
                           db: AsyncSession = Depends(get_async_session), 
-                          current_user: user_model.User = Depends(oauth2.get_current_user)):
+                          current_user: Principal = Depends(oauth2.get_current_principal)):
     """
     Create a new tab for the current user.
 
     Args:
         tab (room_schema.RoomTabsCreate): A dictionary containing the details of the new tab.
         db (AsyncSession): The database session.
-        current_user (user_model.User): The currently authenticated user.
+        current_user (Principal): The currently authenticated user.
 
     Raises:
         HTTPException: If the tab already exists or if there is an internal server error.
@@ -75,13 +77,13 @@ async def create_user_tab(tab: room_schema.RoomTabsCreate,
 
 @router.get("/")
 async def get_user_all_rooms_in_all_tabs(db: AsyncSession = Depends(get_async_session),
-                                         current_user: user_model.User = Depends(oauth2.get_current_user)) -> list:
+                                         current_user: Principal = Depends(oauth2.get_current_principal)) -> list:
     """
     Get all tabs for the current user.
 
     Args:
         db (Session): The database session.
-        current_user (user_model.User): The currently authenticated user.
+        current_user (Principal): The currently authenticated user.
 
     Returns:
         List[room_schema.RoomTabs]: A list of tabs for the current user.
@@ -94,34 +96,19 @@ async def get_user_all_rooms_in_all_tabs(db: AsyncSession = Depends(get_async_se
         # Initialize a list to store tabs along with their rooms
         tabs_with_rooms = []
 
-        # Fetch rooms and tabs details for the current user
-        rooms_and_tabs_query = await db.execute(select(room_model.Rooms, room_model.RoomsTabs
-            ).join(room_model.RoomsTabs, room_model.Rooms.id == room_model.RoomsTabs.room_id
+        # Fetch the rooms in the current user's tabs
+        rooms_in_tabs_query = await db.execute(select(room_model.RoomsTabs
             ).filter(room_model.RoomsTabs.user_id == current_user.id))
-        rooms_and_tabs = rooms_and_tabs_query.all()
+        rooms_in_tabs = rooms_in_tabs_query.scalars().all()
 
-
-        # Using separate queries for counting messages and users
-        messages_count = await get_count_messages(db)
-
-        users_count = await get_count_users(db)
+        cards = await get_room_cards({tab.room_id for tab in rooms_in_tabs}, db)
 
         # Organize rooms into the appropriate tabs
         room_dict = {tab_id: [] for tab_id in [tab.id for tab in user_tabs]}
-        for room, tab in rooms_and_tabs:
-            room_info = {
-                "id": room.id,
-                "owner": room.owner,
-                "name_room": room.name_room,
-                "image_room": room.image_room,
-                "count_users": next((uc.count for uc in users_count if uc.name_room == room.name_room), 0),
-                "count_messages": next((mc.count for mc in messages_count if mc.rooms == room.name_room), 0),
-                "created_at": room.created_at,
-                "secret_room": room.secret_room,
-                "favorite": tab.favorite,
-                "block": room.block
-            }
-            room_dict[tab.tab_id].append(room_info)
+        for tab in rooms_in_tabs:
+            card = cards.get(tab.room_id)
+            if card is not None and tab.tab_id in room_dict:
+                room_dict[tab.tab_id].append(dict(card, favorite=bool(tab.favorite)))
 
         # Create the final list of tabs with sorted rooms
         for tab in user_tabs:
@@ -146,14 +133,14 @@ async def get_user_all_rooms_in_all_tabs(db: AsyncSession = Depends(get_async_se
 @router.get('/{tab_id}')
 async def get_rooms_in_one_tab(tab_id: int = None,
                                 db: AsyncSession = Depends(get_async_session),
-                                current_user: user_model.User = Depends(oauth2.get_current_user)
+                                current_user: Principal = Depends(oauth2.get_current_principal)
                               ):
     """
     Get all rooms in a specific tab.
 
     Args:
         db (Session): The database session.
-        current_user (user_model.User): The currently authenticated user.
+        current_user (Principal): The currently authenticated user.
         tab_id (str): The name of the tab.
 
     Returns:
@@ -170,43 +157,13 @@ async def get_rooms_in_one_tab(tab_id: int = None,
                 detail=f"Tab {tab_id} not found"
             )
 
-        # Fetch rooms and tabs details for the current user in the specified tab
-        rooms_and_tabs_query = await db.execute(select(room_model.Rooms, room_model.RoomsTabs
-            ).join(room_model.RoomsTabs, room_model.Rooms.id == room_model.RoomsTabs.room_id
+        # Fetch the rooms in the specified tab with their favorite flags
+        rooms_in_tab_query = await db.execute(select(room_model.RoomsTabs.room_id, room_model.RoomsTabs.favorite
             ).filter(room_model.RoomsTabs.user_id == current_user.id,
                      room_model.RoomsTabs.tab_id == tab_id))
-        rooms_and_tabs = rooms_and_tabs_query.all()
-
-        # Using separate queries for counting messages and users
-        messages_count = await get_count_messages(db)
-
-        users_count = await get_count_users(db)
-
-
-        # Initialize an empty dictionary to store tabs with their associated rooms
-         # Prepare room details
-        room_details = []
-        for room, tab_info in rooms_and_tabs:
-            room_info = {
-                "id": room.id,
-                "owner": room.owner,
-                "name_room": room.name_room,
-                "image_room": room.image_room,
-                "count_users": next((uc.count for uc in users_count if uc.name_room == room.name_room), 0),
-                "count_messages": next((mc.count for mc in messages_count if mc.rooms == room.name_room), 0),
-                "created_at": room.created_at,
-                "secret_room": room.secret_room,
-                "favorite": tab_info.favorite,
-                "block": room.block
-            }
-
-            # Append room info to the list
-            room_details.append(room_info)
-
-        # Optionally, sort rooms by a specific criterion
-        room_details.sort(key=lambda x: x['favorite'], reverse=True)
+        favorites = dict(rooms_in_tab_query.all())
 
-        return room_details
+        return await get_favorite_room_cards(favorites, db)
     except Exception as e:
         logger.error(f"Error fetching rooms in tab: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -217,7 +174,7 @@ async def get_rooms_in_one_tab(tab_id: int = None,
 @router.post('/add-room-to-tab/{tab_id}')
 async def add_rooms_to_tab(tab_id: int, room_ids: List[UUID],
                            db: AsyncSession = Depends(get_async_session),
-                           current_user: user_model.User = Depends(oauth2.get_current_user)):
+                           current_user: Principal = Depends(oauth2.get_current_principal)):
     """
     Add multiple rooms to a tab, remove them from other tabs if they exist.
 
@@ -225,7 +182,7 @@ async def add_rooms_to_tab(tab_id: int, room_ids: List[UUID],
         tab_id (int): The ID of the tab to add the rooms to.
         room_ids (List[int]): A list of room IDs to add.
         db (Session): The database session.
-        current_user (user_model.User): The currently authenticated user.
+        current_user (Principal): The currently authenticated user.
 
     Returns:
         dict: Confirmation of the rooms added to the tab.
@@ -280,7 +237,7 @@ async def add_rooms_to_tab(tab_id: int, room_ids: List[UUID],
 async def update_tab(tab_id: int,
                      update: room_schema.TabUpdate,
                      db: AsyncSession = Depends(get_async_session),
-                     current_user: user_model.User = Depends(oauth2.get_current_user)):
+                     current_user: Principal = Depends(oauth2.get_current_principal)):
     try:
         if current_user.blocked:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
@@ -307,7 +264,7 @@ async def update_tab(tab_id: int,
 async def room_update_to_favorites(room_id: UUID,
                                 favorite: bool,
                                 db: AsyncSession = Depends(get_async_session),
-                                current_user: user_model.User = Depends(oauth2.get_current_user)):
+                                current_user: Principal = Depends(oauth2.get_current_principal)):
     """
     Updates the favorite status of a room in tab for a specific user.
 
@@ -315,7 +272,7 @@ async def room_update_to_favorites(room_id: UUID,
         room_id (int): The ID of the room to update.
         favorite (bool): The new favorite status for the room.
         db (Session): The database session.
-        current_user (user_model.User): The currently authenticated user.
+        current_user (Principal): The currently authenticated user.
 
     Returns:
         dict: A dictionary containing the room ID and the updated favorite status.
@@ -360,14 +317,14 @@ async def room_update_to_favorites(room_id: UUID,
 @router.delete('/')
 async def deleted_tab(tab_id: int,
                       db: AsyncSession = Depends(get_async_session),
-                      current_user: user_model.User = Depends(oauth2.get_current_user)):
+                      current_user: Principal = Depends(oauth2.get_current_principal)):
     """
     Delete a tab.
 
     Args:
         tab_id: int
         db (Session): The database session.
-        current_user (user_model.User): The currently authenticated user.
+        current_user (Principal): The currently authenticated user.
 
     Raises:
         HTTPException: If the tab does not exist or the user does not have sufficient permissions.
@@ -397,7 +354,7 @@ async def deleted_tab(tab_id: int,
 @router.delete('/delete-room-in-tab/{tab_id}')
 async def delete_room_from_tab(tab_id: int, room_ids: List[UUID],
                                db: AsyncSession = Depends(get_async_session),
-                               current_user: user_model.User = Depends(oauth2.get_current_user)):
+                               current_user: Principal = Depends(oauth2.get_current_principal)):
     """
     Remove rooms from a tab.
 
@@ -405,7 +362,7 @@ async def delete_room_from_tab(tab_id: int, room_ids: List[UUID],
         tab_id (int): The ID of the tab to remove rooms from.
         room_ids (List[int]): List of room IDs to remove.
         db (Session): The database session.
-        current_user (user_model.User): The currently authenticated user.
+        current_user (Principal): The currently authenticated user.
 
     Returns:
         Response: HTTP status indicating the outcome.
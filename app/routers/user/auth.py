@@ -16,7 +16,7 @@ from sqlalchemy.future import select
 
 from app.database import async_db
 
-from ...config import utils
+from app.settings.passwords import password_service
 from ...auth import oauth2
 from app.config.config import settings
 from app.models import user_model
@@ -105,15 +105,16 @@ async def login(user_credentials: Annotated[OAuth2PasswordRequestForm, Depends()
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                                 detail=f"User with ID {user.id} is not active")
         
-        if not utils.verify(user_credentials.password, user.password):
+        valid, new_hash = await password_service.verify_and_update(user_credentials.password, user.password)
+        if not valid:
 
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Credentials")
 
-        access_token = await oauth2.create_access_token(user_id=user.id,
-                                                        db=db)
-        
-        refresh_token = await oauth2.create_refresh_token(user_id=user.id,
-                                                          db=db)
+        # Stored with an older bcrypt cost, upgrade it along with the refresh token
+        if new_hash:
+            user.password = new_hash
+
+        access_token, refresh_token = oauth2.issue_token_pair(user)
 
         user.refresh_token = refresh_token
         await db.commit()
@@ -182,7 +183,7 @@ async def refresh_access_token(refresh_token: str,
         if user_id is None:
             raise credentials_exception
         
-        new_access_token = await oauth2.create_access_token(user_id=user_id, db=db)
+        new_access_token = oauth2.create_access_token(user)
         return {"access_token": new_access_token, "token_type": "bearer"}
     except JWTError:
         auth_logger.error(f"Invalid refresh token: {refresh_token}", exc_info=True)
@@ -1,31 +1,21 @@
 from fastapi import APIRouter, Depends, Request
-<<<<<<< HEAD
-=======
 
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi.templating import Jinja2Templates
 from app.models import user_model
+from app.cache.principals import principal_cache
 from app.database.async_db import get_async_session
-<<<<<<< HEAD
-
-=======
 from app.config import  crypto_encrypto
 from app.routers.mail import update_mail
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
 
 
 @router.get("/success_registration", include_in_schema=False)
-<<<<<<< HEAD
-async def verify_email(token: str, request: Request, db: AsyncSession = Depends(get_async_session)):
-=======
 async def verify_email(token: str, request: Request,
                        db: AsyncSession = Depends(get_async_session)):
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     """
     Verifies the user's email address using the provided token.
     
@@ -40,12 +30,9 @@ async def verify_email(token: str, request: Request,
 
     Returns:
         dict: A message confirming email verification.
-<<<<<<< HEAD
-=======
         @param token:
         @param db:
         @param request:
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     """
     # Query for a user with the matching token_verify field
     # Construct the query
@@ -57,13 +44,6 @@ async def verify_email(token: str, request: Request,
 
     if not user:
         return templates.TemplateResponse("error_page.html", {"request": request})
-<<<<<<< HEAD
-        
-
-    # Update the user's verified status
-    user.verified = True
-    user.token_verify = None  # Clear the token once verified
-=======
 
     #  decryption for token
     email = await crypto_encrypto.decrypt_token(token)
@@ -78,7 +58,7 @@ async def verify_email(token: str, request: Request,
     if update_mail_data:
         update_mail_data.is_active = False
 
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     await db.commit()
+    await principal_cache.invalidate(user.id)
 
     return templates.TemplateResponse("success_registration.html", {"request": request})
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Bulk serialization for list endpoints.
+
+Returning a list of models from a route makes FastAPI validate it against the
+``response_model`` again, walk it with ``jsonable_encoder`` and only then dump it.
+``ListEncoder`` does validation and serialization of the whole list in a single
+pydantic-core call and hands FastAPI the finished bytes, so the route's
+``response_model`` only documents the shape.
+"""
+from typing import Any, Iterable, List, Optional, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class ListEncoder:
+
+    def __init__(self, model: Type[BaseModel]):
+        self.adapter = TypeAdapter(List[model])
+
+    def validate(self, rows: Iterable[Any], from_attributes: bool = False) -> list:
+        """Rows may be dicts, models, or ORM objects/``Row``s with ``from_attributes=True``."""
+        return self.adapter.validate_python(list(rows), from_attributes=from_attributes)
+
+    def to_jsonable(self, rows: Iterable[Any], from_attributes: bool = False) -> list:
+        return self.adapter.dump_python(self.validate(rows, from_attributes), mode="json")
+
+    def dump_json(self, rows: Iterable[Any], from_attributes: bool = False) -> bytes:
+        return self.adapter.dump_json(self.validate(rows, from_attributes))
+
+    def response(self, rows: Iterable[Any], from_attributes: bool = False,
+                 status_code: int = 200, headers: Optional[dict] = None) -> Response:
+        return Response(content=self.dump_json(rows, from_attributes), status_code=status_code,
+                        headers=headers, media_type="application/json")
+
+
+def json_response(data: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """Response for data that is already JSON-ready (e.g. ``ListEncoder.to_jsonable`` output from a cache)."""
+    return Response(content=orjson.dumps(data), status_code=status_code,
+                    headers=headers, media_type="application/json")
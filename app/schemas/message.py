@@ -1,51 +1,19 @@
-from typing import Optional
-<<<<<<< HEAD
-from pydantic import BaseModel, Field, ConfigDict, Json
-=======
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict, Strict, UUID4
 
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 from datetime import datetime
 
 from typing_extensions import Annotated
 
 
-<<<<<<< HEAD
-
-class SocketModel(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-    
-    created_at: datetime
-    receiver_id: Optional[int] = None
-    id: int
-    message: Optional[str] = None
-    fileUrl: Optional[str] = None
-    user_name: Optional[str] = "Unknown user"
-    avatar: Optional[str] = "https://tygjaceleczftbswxxei.supabase.co/storage/v1/object/public/image_bucket/inne/image/boy_1.webp"
-    verified: Optional[bool] = None
-    vote: int
-    id_return: Optional[int] = None 
-    edited: bool
-    return_message: Optional[Json] = None
-    
-class SocketReturnMessage(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-    
-    created_at: datetime
-    receiver_id: Optional[int] = None
-    id: int
+class ReplyPreview(BaseModel):
+    id: Annotated[UUID4, Strict(False)]
     message: Optional[str] = None
-    fileUrl: Optional[str] = None
+    receiver_id: Annotated[UUID4, Strict(False)] = None
     user_name: Optional[str] = "USER DELETE"
-    avatar: Optional[str] = "https://tygjaceleczftbswxxei.supabase.co/storage/v1/object/public/image_bucket/inne/image/boy_1.webp"
-    delete: bool
-        
-class SocketUpdate(BaseModel):
-    message: str
-    
-class Vote(BaseModel):
-    message_id: int
-=======
+    deleted: bool = False
+
+
 class ChatMessagesSchema(BaseModel):
     created_at: datetime
     receiver_id:  Annotated[UUID4, Strict(False)] = None
@@ -62,6 +30,7 @@ class ChatMessagesSchema(BaseModel):
     edited: bool
     deleted: bool
     room_id: Annotated[UUID4, Strict(False)] = None
+    reply: Optional[ReplyPreview] = None
 
 
 # Send message to chat
@@ -87,10 +56,26 @@ class ChatReturnMessage(BaseModel):
     deleted: bool
     room_id: Annotated[UUID4, Strict(False)] = None
 
+MESSAGE_BATCH_LIMIT = 300
+
+
+class ChatMessageBatch(BaseModel):
+    ids: Annotated[List[UUID4], Field(min_length=1, max_length=MESSAGE_BATCH_LIMIT)]
+
+
 class ChatUpdateMessage(BaseModel):
     message: str
     
 class ChatSchemasVote(BaseModel):
     message_id: Annotated[UUID4, Strict(False)]
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
-    dir: Annotated[int, Field(strict=True, le=1)]
\ No newline at end of file
+    dir: Annotated[int, Field(strict=True, le=1)]
+
+
+class RoomReadMarkerUpdate(BaseModel):
+    message_id: Optional[UUID4] = None
+
+
+class RoomUnread(BaseModel):
+    room_id: UUID4
+    unread: int
+    last_read_message_id: Optional[UUID4] = None
@@ -1,13 +1,6 @@
-
-<<<<<<< HEAD
-from pydantic import BaseModel, ConfigDict      #, HttpUrl
-from datetime import datetime
-from typing import Optional, List
-=======
 from pydantic import BaseModel, ConfigDict, UUID4, Strict    #, HttpUrl
 from datetime import datetime
 from typing import Optional, List, Annotated
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
 
 
 
@@ -15,13 +8,8 @@ from typing import Optional, List, Annotated
 class RoomBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
-<<<<<<< HEAD
-    id: int
-    owner: int
-=======
     id: Annotated[UUID4, Strict(False)]
     owner: Annotated[UUID4, Strict(False)]
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     name_room: str
     image_room: str
     count_users: int
@@ -30,10 +18,7 @@ class RoomBase(BaseModel):
     secret_room: bool
     block: Optional[bool] = None
     description: Optional[str] = None
-<<<<<<< HEAD
-=======
     delete_at: Optional[datetime] = None
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
         
 class RoomFavorite(RoomBase):
     favorite: bool
@@ -59,14 +44,6 @@ class RoomPost(RoomBase):
 class RoomUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
-<<<<<<< HEAD
-    id: int
-    name_room: str
-    image_room: str
-    owner: int
-    created_at: datetime
-    secret_room: Optional[Optional[bool]]
-=======
     id: Annotated[UUID4, Strict(False)]
     name_room: str
     image_room: str
@@ -76,19 +53,25 @@ class RoomUpdate(BaseModel):
     block: bool
     description: Optional[str] = None
     delete_at: Optional[datetime] = None
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
        
+class RoomMeta(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: Annotated[UUID4, Strict(False)]
+    name_room: str
+    owner: Optional[Annotated[UUID4, Strict(False)]] = None
+    block: bool
+    secret_room: Optional[bool] = None
+    company_id: Optional[Annotated[UUID4, Strict(False)]] = None
+
+
 class RoomUpdateDescription(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     description: Optional[str] = None
         
 class RoomManager(BaseModel):
     model_config = ConfigDict(from_attributes=True)
-<<<<<<< HEAD
-    room_id: int
-=======
     room_id: Annotated[UUID4, Strict(False)]
->>>>>>> b76081a8ec4b9a820a3d0f1adef71c7e7cef6824
     
         
 class RoomTabsCreate(BaseModel):
@@ -108,9 +91,9 @@ class Tab(BaseModel):
 
 
 class CountMessages(BaseModel):
-    rooms: str
+    room_id: Annotated[UUID4, Strict(False)]
     count: int
     
 class CountUsers(BaseModel):
-    rooms: str
+    room_id: Annotated[UUID4, Strict(False)]
     count: int
\ No newline at end of file
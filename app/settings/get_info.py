@@ -3,9 +3,10 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func
+from sqlalchemy import func, literal_column
 
 from app.models import company_model, room_model, user_model, messages_model
+from app.cache.room_meta import room_meta_cache
 from app.config.start_schema import start_app
 
 
@@ -37,6 +38,19 @@ async def get_room_hell(db: AsyncSession):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="Error in get_room_hell")
 
+_room_hell_id = None
+
+
+async def get_room_hell_id(db: AsyncSession) -> UUID:
+    """Id of the default room. It never changes, so each worker looks it up once."""
+    global _room_hell_id
+    if _room_hell_id is None:
+        room = await get_room_hell(db)
+        if room is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Default room not found")
+        _room_hell_id = room.id
+    return _room_hell_id
+
 async def get_user(user_id: UUID, db: AsyncSession):
     try:
         user_query = await db.execute(select(user_model.User).where(user_model.User.id == user_id))
@@ -83,21 +97,50 @@ async def check_deactivation_user(email: str, user_name: str, db: AsyncSession):
 
 
 async def get_room_name(name_room: str, db: AsyncSession):
+    """Cached ``RoomMeta`` of the room called ``name_room`` (or ``None``)."""
     try:
-        query_room = await db.execute(select(room_model.Rooms).where(room_model.Rooms.name_room == name_room))
-        room = query_room.scalar_one_or_none()
-        return room
+        return await room_meta_cache.get_by_name(name_room, db)
     except Exception as e:
         logger.error(f"Error occurred while retrieving room name: {e}")
         raise HTTPException(status_code=status.HTTP_424_FAILED_DEPENDENCY, detail=str(e))
 
 
 async def get_room_by_id(room_id: UUID, db: AsyncSession):
+    """
+    Cached ``RoomMeta`` of a room (or ``None``) for checks that don't change it;
+    use ``load_room`` to load a room that is going to be modified.
+    """
+    try:
+        return await room_meta_cache.get(room_id, db)
+    except Exception as e:
+        logger.error(f"Error occurred while retrieving room by ID: {e}")
+        raise HTTPException(status_code=status.HTTP_424_FAILED_DEPENDENCY, detail=str(e))
+
+async def load_room(room_id: UUID, db: AsyncSession):
+    """The room's ORM row (or ``None``), read from the database; invalidate ``room_meta_cache`` after changing it."""
     try:
         result = await db.execute(select(room_model.Rooms).where(room_model.Rooms.id == room_id))
         return result.scalar_one_or_none()
     except Exception as e:
-        logger.error(f"Error occurred while retrieving room by ID: {e}")
+        logger.error(f"Error occurred while loading room: {e}")
+        raise HTTPException(status_code=status.HTTP_424_FAILED_DEPENDENCY, detail=str(e))
+
+async def get_room_version(room_id: UUID, db: AsyncSession):
+    """
+    Returns ``(block, version, card_version)`` of a room from one primary-key lookup, or ``None`` if the
+    room does not exist. ``version`` changes whenever the room's messages or settings do, ``card_version``
+    whenever any user's name, avatar or verified flag does.
+    """
+    try:
+        version_query = await db.execute(
+            select(room_model.Rooms.block, func.coalesce(messages_model.RoomStats.version, 0).label('version'),
+                   literal_column("(SELECT last_value FROM user_cards_version_seq)").label('card_version'))
+            .outerjoin(messages_model.RoomStats, messages_model.RoomStats.room_id == room_model.Rooms.id)
+            .where(room_model.Rooms.id == room_id)
+        )
+        return version_query.first()
+    except Exception as e:
+        logger.error(f"Error occurred while retrieving room version: {e}")
         raise HTTPException(status_code=status.HTTP_424_FAILED_DEPENDENCY, detail=str(e))
 
 async def has_permission_to_the_room(current_user: user_model.User, room: room_model.Rooms):
@@ -116,14 +159,15 @@ async def has_verified_or_blocked_user(current_user: user_model.User):
 
 
 async def get_count_messages(db: AsyncSession):
+    """Message count per room id, read from the trigger-maintained ``room_stats``."""
+    hell_id = await get_room_hell_id(db)
     try:
         messages_count = await db.execute(
             select(
-                messages_model.ChatMessages.rooms,
-                func.count(messages_model.ChatMessages.id).label('count')
+                messages_model.RoomStats.room_id,
+                messages_model.RoomStats.message_count.label('count')
             )
-            .group_by(messages_model.ChatMessages.rooms)
-            .where(messages_model.ChatMessages.rooms != hell)
+            .where(messages_model.RoomStats.room_id != hell_id)
         )
         messages_count = messages_count.all()
         return messages_count
@@ -132,14 +176,15 @@ async def get_count_messages(db: AsyncSession):
         raise HTTPException(status_code=status.HTTP_424_FAILED_DEPENDENCY, detail=str(e))
 
 async def get_count_users(db: AsyncSession):
+    """Member count per room id, read from the trigger-maintained ``room_stats``."""
+    hell_id = await get_room_hell_id(db)
     try:
         users_count = await db.execute(
             select(
-                user_model.UserStatus.name_room,
-                func.count(user_model.UserStatus.id).label('count')
+                messages_model.RoomStats.room_id,
+                messages_model.RoomStats.member_count.label('count')
             )
-            .group_by(user_model.UserStatus.name_room)
-            .where(user_model.UserStatus.name_room != hell)
+            .where(messages_model.RoomStats.room_id != hell_id)
         )
         users_count = users_count.all()
         return users_count
@@ -0,0 +1,30 @@
+"""
+The parts of room history (``GET /messages/{room_id}``) that don't need a session.
+
+``HistoryLimit`` declares the page size the endpoint accepts; anything outside 1 to
+``MESSAGE_PAGE_MAX`` is rejected with a 422 before the room is read. Whole rooms are read
+through the export instead. ``reply_targets_query`` loads the messages quoted by a page.
+"""
+from typing import Annotated, Iterable
+from uuid import UUID
+
+from fastapi import Query
+from sqlalchemy import Select
+from sqlalchemy.future import select
+
+from app.models import messages_model
+
+# Default and largest page of room history
+MESSAGE_PAGE_SIZE = 50
+MESSAGE_PAGE_MAX = 200
+
+HistoryLimit = Annotated[int, Query(ge=1, le=MESSAGE_PAGE_MAX)]
+
+
+def reply_targets_query(room_id: UUID, reply_ids: Iterable[UUID]) -> Select:
+    """
+    The messages among ``reply_ids`` that belong to ``room_id``. ``id_return`` is set by clients,
+    so a reply must never preview a message of another room.
+    """
+    return select(messages_model.ChatMessages).where(messages_model.ChatMessages.id.in_(list(reply_ids)),
+                                                     messages_model.ChatMessages.room_id == room_id)
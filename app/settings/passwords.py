@@ -0,0 +1,138 @@
+"""
+Password hashing off the event loop.
+
+bcrypt takes tens to hundreds of milliseconds per call by design. ``password_service``
+runs it on a dedicated pool of ``settings.password_workers`` threads (bcrypt releases the
+GIL), so a burst of logins no longer stalls every other request on the worker. At most
+``settings.password_queue_size`` calls wait for a thread; beyond that callers get a 503
+instead of piling up. ``stats()`` reports the queue depth and waiting times.
+
+New hashes use ``settings.bcrypt_rounds``. Logins go through ``verify_and_update``, which
+also returns a fresh hash when the stored one was made with another cost, so raising the
+cost upgrades users as they log in.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import bcrypt
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+
+from _log_config.log_config import get_logger
+from app.config.config import settings
+
+load_dotenv()
+
+PEPPER = os.getenv("PASSWORD_PEPPER")
+if not PEPPER:
+    raise ValueError("PASSWORD_PEPPER is not set in the environment variables.")
+
+password_logger = get_logger('passwords', 'passwords.log')
+
+
+def hash_password(password: str, rounds: int, pepper: str = PEPPER) -> str:
+    password_with_pepper = f"{password}{pepper}"
+    return bcrypt.hashpw(password_with_pepper.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def check_password(password: str, hashed_password: str, pepper: str = PEPPER) -> bool:
+    password_with_pepper = f"{password}{pepper}"
+    return bcrypt.checkpw(password_with_pepper.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """The cost factor of a ``$2b$12$...`` hash, or ``None`` if it is not a bcrypt hash."""
+    try:
+        return int(hashed_password.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordService:
+
+    def __init__(self, rounds: int, workers: int, queue_size: int, pepper: str = PEPPER):
+        self.rounds = rounds
+        self.workers = workers
+        self.queue_size = queue_size
+        self.pepper = pepper
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.wait_seconds = 0.0
+
+    async def _run(self, func, *args):
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            password_logger.warning(f"Password pool full: {self.pending} calls pending")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Too many password checks in progress, try again",
+                                headers={"Retry-After": "1"})
+
+        queued_at = time.perf_counter()
+
+        def job():
+            return time.perf_counter(), func(*args)
+
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            started_at, result = await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.wait_seconds += started_at - queued_at
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds, self.pepper)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """``False`` for a wrong password and for a stored value that is not a bcrypt hash."""
+        try:
+            return await self._run(check_password, password, hashed_password, self.pepper)
+        except HTTPException:
+            raise
+        except Exception as e:
+            password_logger.error(f"Error verifying password: {e}")
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return hash_rounds(hashed_password) != self.rounds
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns ``(valid, new_hash)``. ``new_hash`` is set when the password is valid but its hash
+        was made with another cost factor; the caller stores it.
+        """
+        if not await self.verify(password, hashed_password):
+            return False, None
+        if not self.needs_rehash(hashed_password):
+            return True, None
+        self.rehashed += 1
+        return True, await self.hash(password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self.pending,
+            "queued": max(self.pending - self.workers, 0),
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+
+password_service = PasswordService(
+    rounds=settings.bcrypt_rounds,
+    workers=settings.password_workers,
+    queue_size=settings.password_queue_size,
+)
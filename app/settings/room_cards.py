@@ -0,0 +1,186 @@
+"""
+Room cards for every room listing.
+
+A card is a room's own columns plus its message and member counts from ``room_stats``.
+Listings select the rooms they show with ``room_cards_query()`` (one query with the
+counts joined in) or, when the set of rooms comes from a membership table, look them
+up by id with ``get_room_cards`` and attach per-user fields such as ``favorite`` from a
+dict. Either way a listing costs a fixed number of queries however many rooms it shows.
+
+The room directory is paged with ``room_page_query``: keyset pagination over one of
+``ROOM_SORTS``, continued from an opaque cursor built from the last card of a page.
+"""
+import base64
+from datetime import datetime
+from typing import Dict, Iterable, List, Literal, Mapping, Optional, Tuple
+from uuid import UUID
+
+import orjson
+from sqlalchemy import func, literal, tuple_, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import messages_model, room_model
+
+
+def room_cards_query(stats_join: bool = False) -> Select:
+    """
+    Rooms with their counts; add ``where``/``order_by`` (``count_messages`` and ``count_users`` are labels).
+
+    ``room_stats`` is outer joined, unless ``stats_join`` asks for an inner join so the planner can walk
+    its indexes; every room has a stats row (inserted by trigger, existing rooms by migration).
+    """
+    query = (
+        select(
+            room_model.Rooms.id,
+            room_model.Rooms.owner,
+            room_model.Rooms.name_room,
+            room_model.Rooms.image_room,
+            room_model.Rooms.created_at,
+            room_model.Rooms.secret_room,
+            room_model.Rooms.block,
+            room_model.Rooms.delete_at,
+            room_model.Rooms.description,
+            func.coalesce(messages_model.RoomStats.message_count, 0).label('count_messages'),
+            func.coalesce(messages_model.RoomStats.member_count, 0).label('count_users')
+        )
+    )
+    on_stats = messages_model.RoomStats.room_id == room_model.Rooms.id
+    if stats_join:
+        return query.join(messages_model.RoomStats, on_stats)
+    return query.outerjoin(messages_model.RoomStats, on_stats)
+
+
+def room_card(row, favorite: Optional[bool] = None) -> dict:
+    card = {
+        "id": row.id,
+        "owner": row.owner,
+        "name_room": row.name_room,
+        "image_room": row.image_room,
+        "count_users": row.count_users,
+        "count_messages": row.count_messages,
+        "created_at": row.created_at,
+        "secret_room": row.secret_room,
+        "block": row.block,
+        "description": row.description,
+        "delete_at": row.delete_at
+    }
+    if favorite is not None:
+        card["favorite"] = favorite
+    return card
+
+
+def assemble_room_cards(rows, favorites: Optional[Mapping[UUID, Optional[bool]]] = None) -> List[dict]:
+    """
+    Cards for rows of ``room_cards_query()`` in row order. With ``favorites`` every card gets
+    a ``favorite`` flag (missing or NULL means ``False``).
+    """
+    if favorites is None:
+        return [room_card(row) for row in rows]
+    return [room_card(row, bool(favorites.get(row.id))) for row in rows]
+
+
+async def get_room_cards(room_ids: Iterable[UUID], db: AsyncSession) -> Dict[UUID, dict]:
+    """Cards of the given rooms keyed by room id, in one query. Unknown ids are left out."""
+    room_ids = set(room_ids)
+    if not room_ids:
+        return {}
+    result = await db.execute(room_cards_query().where(room_model.Rooms.id.in_(room_ids)))
+    return {row.id: room_card(row) for row in result.all()}
+
+
+def sort_by_favorite(cards: List[dict]) -> List[dict]:
+    """Favorites first; the sort is stable, so the order within each group is kept."""
+    cards.sort(key=lambda card: card["favorite"], reverse=True)
+    return cards
+
+
+async def get_favorite_room_cards(favorites: Mapping[UUID, Optional[bool]], db: AsyncSession) -> List[dict]:
+    """
+    Cards of the rooms in ``favorites`` (room id -> the user's favorite flag), favorites first
+    and otherwise in the mapping's order.
+    """
+    cards = await get_room_cards(favorites, db)
+    return sort_by_favorite([dict(cards[room_id], favorite=bool(favorite))
+                             for room_id, favorite in favorites.items() if room_id in cards])
+
+
+RoomSort = Literal["messages", "activity", "members", "newest", "name"]
+ROOM_PAGE_SIZE = 50
+ROOM_PAGE_MAX = 200
+
+# Sort name -> (key, room id column, ascending). Ties are broken by room id in the same direction,
+# so (key, id) is a total order and a page can continue from the row comparison ``(key, id) < cursor``.
+# Pages join ``room_stats`` (every room has a row), so the count sorts use the bare columns and walk
+# the (count DESC, room_id DESC) indexes, and newest and name walk the rooms indexes. Activity falls
+# back to the creation time of rooms without messages, and that expression is sorted, not indexed.
+ROOM_SORTS = {
+    "messages": (messages_model.RoomStats.message_count, messages_model.RoomStats.room_id, False),
+    "members": (messages_model.RoomStats.member_count, messages_model.RoomStats.room_id, False),
+    "activity": (func.coalesce(messages_model.RoomStats.last_message_at, room_model.Rooms.created_at),
+                 room_model.Rooms.id, False),
+    "newest": (room_model.Rooms.created_at, room_model.Rooms.id, False),
+    "name": (room_model.Rooms.name_room, room_model.Rooms.id, True),
+}
+TIME_SORTS = {"activity", "newest"}
+COUNT_SORTS = {"messages", "members"}
+
+
+def encode_room_cursor(sort: str, value, room_id: UUID) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = orjson.dumps([sort, value, str(room_id)])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_room_cursor(cursor: str, sort: str) -> Tuple[object, UUID]:
+    """
+    Returns the ``(key, room id)`` position a cursor points at.
+
+    Raises:
+        ValueError: If the cursor is malformed, was issued for another sort, or its key
+            does not have the type of the sort key.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, room_id = orjson.loads(raw)
+        if cursor_sort != sort:
+            raise ValueError(f"cursor is for sort {cursor_sort!r}")
+        if sort in TIME_SORTS:
+            value = datetime.fromisoformat(value)
+        elif sort in COUNT_SORTS and (not isinstance(value, int) or isinstance(value, bool)):
+            raise ValueError(f"expected a count, got {value!r}")
+        elif sort not in COUNT_SORTS and not isinstance(value, str):
+            raise ValueError(f"expected a room name, got {value!r}")
+        return value, UUID(room_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+
+def room_page_query(sort: str, limit: int, position: Optional[Tuple[object, UUID]] = None) -> Select:
+    """
+    ``room_cards_query()`` ordered by ``sort`` after ``position``; add the listing's ``where``.
+    Fetches one row more than ``limit`` so ``room_page`` can tell whether another page follows.
+    """
+    key, room_id_column, ascending = ROOM_SORTS[sort]
+    query = room_cards_query(stats_join=True).add_columns(key.label('sort_key'))
+    if position is not None:
+        value, room_id = position
+        after = tuple_(literal(value, key.type), literal(room_id, room_model.Rooms.id.type))
+        current = tuple_(key, room_id_column)
+        query = query.where(current > after if ascending else current < after)
+    if ascending:
+        query = query.order_by(key.asc(), room_id_column.asc())
+    else:
+        query = query.order_by(key.desc(), room_id_column.desc())
+    return query.limit(limit + 1)
+
+
+def room_page(rows, sort: str, limit: int) -> Tuple[List[dict], Optional[str]]:
+    """Cards of a ``room_page_query`` result and the cursor of the next page (``None`` on the last one)."""
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_room_cursor(sort, rows[-1].sort_key, rows[-1].id)
+    return assemble_room_cards(rows), next_cursor
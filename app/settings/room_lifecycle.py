@@ -0,0 +1,213 @@
+"""
+Room creation and removal.
+
+Creating a room writes the room, its owner's role, the owner's "my rooms" entry and (for
+secret rooms) the secret-room entry in one transaction. The name is not checked
+beforehand: the unique constraint on ``rooms.name_room`` rejects a taken name when the
+room is flushed, and the caller gets the ``IntegrityError``. The image is only uploaded or
+picked once the flush has succeeded, so a taken name never leaves an orphaned upload.
+
+Deleting a room moves its members to the default room with a single ``UPDATE``, removes
+its messages (and the reports and notifications that reference them) in chunks of
+``settings.room_delete_chunk_size``, each in its own transaction, and then deletes the
+rooms in one statement; the remaining per-room rows (managers, tabs, roles, bans, read
+markers) go with the database's ``ON DELETE CASCADE``. Nothing is loaded into the
+session, and no transaction holds locks on more than one chunk of a large room.
+
+If a removal stops half way, the rooms are still there with fewer messages and running it
+again finishes the job; the hourly ``room_stats`` reconcile restores their counters.
+"""
+import asyncio
+from typing import Awaitable, Iterable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from _log_config.log_config import get_logger
+from app.cache.room_directory import room_directory_cache
+from app.cache.room_history import room_history_cache
+from app.cache.room_meta import room_meta_cache
+from app.config.config import settings
+from app.config.start_schema import start_app
+from app.models import messages_model, reports_model, room_model, user_model
+from app.schemas.room import RoomCreateV2
+from app.settings.get_info import get_room_hell_id
+
+logger = get_logger('room_lifecycle', 'room_lifecycle.log')
+
+BULK = {"synchronize_session": False}
+
+
+async def create_room(owner: user_model.User, room_data: RoomCreateV2, image: Awaitable[str],
+                      db: AsyncSession) -> room_model.Rooms:
+    """
+    Creates a room owned by ``owner`` in one transaction.
+
+    Args:
+        owner (user_model.User): The user creating the room.
+        room_data (RoomCreateV2): Name, description and secret flag.
+        image (Awaitable[str]): Resolves to the room's image URL; only started once the room is flushed,
+            so nothing is uploaded for a name that is taken.
+        db (AsyncSession): The database session.
+
+    Raises:
+        IntegrityError: If a room with this name already exists. Nothing is written.
+
+    Returns:
+        room_model.Rooms: The new room.
+    """
+    # The id is generated here so the other rows can reference the room before it is flushed
+    room = room_model.Rooms(id=uuid4(),
+                            owner=owner.id,
+                            image_room=start_app.default_room_image,
+                            company_id=owner.company_id,
+                            **room_data.model_dump())
+    try:
+        db.add(room)
+        await db.flush()
+
+        room.image_room = await image
+        db.add_all([
+            room_model.RoleInRoom(user_id=owner.id, room_id=room.id, role="owner"),
+            room_model.RoomsManagerMyRooms(user_id=owner.id, room_id=room.id),
+        ])
+        if room_data.secret_room:
+            db.add(room_model.RoomsManagerSecret(user_id=owner.id, room_id=room.id))
+        await db.commit()
+    except BaseException:
+        if asyncio.iscoroutine(image):
+            # Never started if the flush failed; closing it avoids the "never awaited" warning
+            image.close()
+        await db.rollback()
+        raise
+
+    # Loads the server defaults (created_at, block) for the response
+    await db.refresh(room)
+    await room_directory_cache.invalidate(room.company_id)
+    return room
+
+
+async def move_members_to_hell(room_ids: Iterable[UUID], db: AsyncSession) -> int:
+    """
+    Moves every member of the given rooms to the default room. Does not commit.
+
+    Returns:
+        int: The number of members moved.
+    """
+    result = await db.execute(
+        update(user_model.UserStatus)
+        .where(user_model.UserStatus.room_id.in_(list(room_ids)))
+        .values(room_id=await get_room_hell_id(db))
+        .execution_options(**BULK)
+    )
+    return result.rowcount
+
+
+async def delete_room_messages(room_id: UUID, db: AsyncSession, chunk_size: Optional[int] = None) -> int:
+    """
+    Deletes the messages of a room, committing after every ``chunk_size`` messages. Chunks are
+    found through ``room_id`` (indexed); old rows without one are removed by
+    ``python -m app.database.backfill drop_room_names`` once their room is gone.
+
+    Returns:
+        int: The number of messages deleted.
+    """
+    chunk_size = chunk_size or settings.room_delete_chunk_size
+    deleted = 0
+    while True:
+        ids_query = await db.execute(select(messages_model.ChatMessages.id)
+                                     .where(messages_model.ChatMessages.room_id == room_id)
+                                     .limit(chunk_size))
+        message_ids = ids_query.scalars().all()
+        if not message_ids:
+            return deleted
+
+        reports = select(reports_model.Report.id).where(reports_model.Report.message_id.in_(message_ids))
+        await db.execute(
+            delete(reports_model.Notification)
+            .where(or_(reports_model.Notification.message_id.in_(message_ids),
+                       reports_model.Notification.report_id.in_(reports)))
+            .execution_options(**BULK)
+        )
+        await db.execute(
+            delete(reports_model.Report)
+            .where(reports_model.Report.message_id.in_(message_ids))
+            .execution_options(**BULK)
+        )
+        result = await db.execute(
+            delete(messages_model.ChatMessages)
+            .where(messages_model.ChatMessages.id.in_(message_ids))
+            .execution_options(**BULK)
+        )
+        await db.commit()
+        deleted += result.rowcount
+
+
+async def delete_rooms(room_ids: Iterable[UUID], db: AsyncSession, chunk_size: Optional[int] = None) -> int:
+    """
+    Deletes rooms with everything in them and drops them from the caches. The default room
+    is never deleted. Commits as it goes.
+
+    Args:
+        room_ids (Iterable[UUID]): The rooms to delete.
+        db (AsyncSession): The database session.
+        chunk_size (int, optional): Messages per transaction; defaults to ``settings.room_delete_chunk_size``.
+
+    Returns:
+        int: The number of rooms deleted.
+    """
+    room_ids = list(room_ids)
+    if not room_ids:
+        return 0
+
+    rooms_query = await db.execute(
+        select(room_model.Rooms.id, room_model.Rooms.company_id)
+        .where(room_model.Rooms.id.in_(room_ids),
+               room_model.Rooms.name_room != start_app.default_room_name)
+    )
+    rooms = rooms_query.all()
+    if not rooms:
+        return 0
+    ids = [room.id for room in rooms]
+
+    moved = await move_members_to_hell(ids, db)
+    # The message triggers update the room_stats row of every deleted message's room;
+    # with the row gone first they have nothing to do
+    await db.execute(
+        delete(messages_model.RoomStats)
+        .where(messages_model.RoomStats.room_id.in_(ids))
+        .execution_options(**BULK)
+    )
+    await db.commit()
+
+    messages = 0
+    for room in rooms:
+        messages += await delete_room_messages(room.id, db, chunk_size)
+
+    await db.execute(
+        delete(reports_model.Notification)
+        .where(reports_model.Notification.room_id.in_(ids))
+        .execution_options(**BULK)
+    )
+    await db.execute(
+        delete(room_model.RoomInvitation)
+        .where(room_model.RoomInvitation.room_id.in_(ids))
+        .execution_options(**BULK)
+    )
+    result = await db.execute(
+        delete(room_model.Rooms)
+        .where(room_model.Rooms.id.in_(ids))
+        .execution_options(**BULK)
+    )
+    await db.commit()
+
+    for room in rooms:
+        await room_history_cache.invalidate(room.id)
+        await room_meta_cache.invalidate(room.id)
+    for company_id in {room.company_id for room in rooms}:
+        await room_directory_cache.invalidate(company_id)
+
+    logger.info(f"Deleted {result.rowcount} rooms with {messages} messages, moved {moved} members")
+    return result.rowcount
@@ -0,0 +1,90 @@
+"""
+Per-row models plus FastAPI's default encoding vs. ``ListEncoder`` for message history.
+
+Run from the project root::
+
+    python -m benchmarks.bulk_serialization --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.schemas.bulk import ListEncoder
+from app.schemas.message import ChatMessagesSchema, WrappedSocketMessage, wrap_message
+
+SIZES = (50, 500, 5000)
+
+
+def make_rows(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [{
+        "created_at": now,
+        "receiver_id": uuid.uuid4(),
+        "message": f"message number {i} " * 4,
+        "fileUrl": None,
+        "voiceUrl": None,
+        "videoUrl": None,
+        "user_name": f"user{i % 40}",
+        "avatar": "https://example.com/avatar.webp",
+        "verified": True,
+        "id": uuid.uuid4(),
+        "vote": i % 7,
+        "id_return": None,
+        "edited": False,
+        "deleted": False,
+        "room_id": uuid.uuid4(),
+    } for i in range(count)]
+
+
+response_adapter = TypeAdapter(List[WrappedSocketMessage])
+
+
+async def per_row_path(rows: List[dict]) -> bytes:
+    """What the route did before: a model and a wrap_message await per row, then FastAPI's
+    response_model handling (dump, re-validate, jsonable_encoder) and JSONResponse's json.dumps."""
+    models = [await wrap_message(ChatMessagesSchema(**row)) for row in rows]
+    validated = response_adapter.validate_python([model.model_dump() for model in models])
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+history_encoder = ListEncoder(WrappedSocketMessage)
+
+
+def bulk_path(rows: List[dict]) -> bytes:
+    return history_encoder.dump_json([{"message": row} for row in rows])
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    print(f"{'rows':>6}{'per-row ms':>14}{'bulk ms':>10}{'speedup':>10}")
+    for size in SIZES:
+        rows = make_rows(size)
+        assert json.loads(loop.run_until_complete(per_row_path(rows))) == json.loads(bulk_path(rows))
+
+        repeat = max(1, args.repeat * SIZES[0] // size)
+        per_row = timed(lambda: loop.run_until_complete(per_row_path(rows)), repeat)
+        bulk = timed(lambda: bulk_path(rows), repeat)
+        print(f"{size:>6}{per_row * 1000:>14.2f}{bulk * 1000:>10.2f}{per_row / bulk:>9.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
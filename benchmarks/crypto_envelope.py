@@ -0,0 +1,50 @@
+"""
+Encrypt/decrypt throughput and stored size per message envelope version.
+
+Run from the project root::
+
+    python -m benchmarks.crypto_envelope --messages 20000 --length 200
+"""
+import argparse
+import os
+import time
+
+from app.config.crypto_encrypto import encrypt, decrypt
+
+VERSIONS = {0: "legacy base64(Fernet)", 1: "v1 Fernet", 2: "v2 AES-GCM"}
+
+
+def bench(version: int, plaintexts):
+    start = time.perf_counter()
+    stored = [encrypt(text, version) for text in plaintexts]
+    encrypt_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for value in stored:
+        decrypt(value)
+    decrypt_seconds = time.perf_counter() - start
+
+    average_size = sum(len(value) for value in stored) / len(stored)
+    return len(plaintexts) / encrypt_seconds, len(plaintexts) / decrypt_seconds, average_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--length", type=int, default=200, help="plaintext length in characters")
+    args = parser.parse_args()
+
+    plaintexts = [os.urandom(args.length // 2).hex() for _ in range(args.messages)]
+
+    results = {version: bench(version, plaintexts) for version in VERSIONS}
+    legacy_size = results[0][2]
+
+    print(f"{args.messages} messages of {args.length} chars")
+    print(f"{'envelope':<24}{'encrypt/s':>12}{'decrypt/s':>12}{'bytes/msg':>12}{'saved':>9}")
+    for version, (encrypt_rate, decrypt_rate, size) in results.items():
+        saved = 1 - size / legacy_size
+        print(f"{VERSIONS[version]:<24}{encrypt_rate:>12,.0f}{decrypt_rate:>12,.0f}{size:>12,.0f}{saved:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Login round trips: three user lookups per login vs. one with ``oauth2.issue_token_pair``.
+
+The old ``/login`` selected the user by email, then ``create_access_token`` and
+``create_refresh_token`` each selected it again by id. The factories now take the loaded
+user. Both paths below do what the endpoint does after reading the form, against the
+configured database, and the statements each of them sends are counted.
+
+bcrypt dominates a real login, so the password check is left out unless ``--verify`` is
+given; without it the difference is the database round trips. With ``--verify`` the check
+runs on ``password_service``'s pool, as in the endpoint; add ``--blocking-verify`` to run
+it on the event loop instead and see what the pool buys under concurrency.
+
+Needs the configured database and the default user from ``.env_start_app``. Run from the
+project root::
+
+    python -m benchmarks.login --logins 200 --concurrency 20
+    python -m benchmarks.login --logins 200 --concurrency 20 --verify --blocking-verify
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event
+from sqlalchemy.future import select
+
+from app.auth import oauth2
+from app.config.start_schema import start_app
+from app.database.async_db import async_session_maker, engine_async
+from app.models import user_model
+from app.settings.passwords import password_service
+
+statements = 0
+blocking_verify = False
+
+
+def count_statement(*args):
+    global statements
+    statements += 1
+
+
+async def check_password(password: str, user: user_model.User):
+    if blocking_verify:
+        from app.config import utils
+        valid = utils.verify(password, user.password)
+    else:
+        valid = await password_service.verify(password, user.password)
+    if not valid:
+        raise ValueError("Invalid Credentials")
+
+
+async def three_lookups(email: str, password, db):
+    """The old login: the email lookup, then one more lookup inside each token factory."""
+    user = (await db.execute(select(user_model.User).where(user_model.User.email == email))).scalar_one()
+    if password is not None:
+        await check_password(password, user)
+    user = (await db.execute(select(user_model.User).where(user_model.User.id == user.id))).scalar_one()
+    access_token = oauth2.create_access_token(user)
+    user = (await db.execute(select(user_model.User).filter(user_model.User.id == user.id))).scalar()
+    refresh_token = oauth2.create_refresh_token(user)
+    user.refresh_token = refresh_token
+    await db.commit()
+    return access_token
+
+
+async def one_lookup(email: str, password, db):
+    user = (await db.execute(select(user_model.User).where(user_model.User.email == email))).scalar_one()
+    if password is not None:
+        await check_password(password, user)
+    access_token, refresh_token = oauth2.issue_token_pair(user)
+    user.refresh_token = refresh_token
+    await db.commit()
+    return access_token
+
+
+async def run(path, email: str, password, logins: int, concurrency: int):
+    global statements
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore, async_session_maker() as db:
+            start = time.perf_counter()
+            await path(email, password, db)
+            latencies.append(time.perf_counter() - start)
+
+    statements = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    return logins / elapsed, statistics.median(latencies), statements / logins
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--email", default=start_app.default_user_email)
+    parser.add_argument("--password", default=start_app.default_user_password)
+    parser.add_argument("--verify", action="store_true", help="include the bcrypt password check")
+    parser.add_argument("--blocking-verify", action="store_true",
+                        help="with --verify, run bcrypt on the event loop instead of the password pool")
+    args = parser.parse_args()
+
+    global blocking_verify
+    blocking_verify = args.blocking_verify
+
+    event.listen(engine_async.sync_engine, "before_cursor_execute", count_statement)
+    password = args.password if args.verify else None
+
+    print(f"{'path':<16}{'logins/s':>10}{'p50 ms':>10}{'statements':>12}")
+    for label, path in (("three lookups", three_lookups), ("one lookup", one_lookup)):
+        throughput, p50, per_login = await run(path, args.email, password, args.logins, args.concurrency)
+        print(f"{label:<16}{throughput:>10.1f}{p50 * 1000:>10.1f}{per_login:>12.1f}")
+    if args.verify and not blocking_verify:
+        print(password_service.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Room cards built with per-room ``next()`` scans over the count lists vs. ``app.settings.room_cards``.
+
+The old listings loaded every room's message and member count and matched them to each
+room by name with a linear scan, so a listing did O(rooms x rooms) work in Python. The
+room-card service gets the counts joined to the rooms and attaches per-user flags by dict
+lookup. Both paths run on the same in-memory rows, so only the assembly is measured.
+
+Run from the project root::
+
+    python -m benchmarks.room_cards --rooms 10000
+"""
+import argparse
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from app.settings.room_cards import room_card, sort_by_favorite
+
+Room = namedtuple("Room", "id owner name_room image_room created_at secret_room block delete_at description")
+CardRow = namedtuple("CardRow", Room._fields + ("count_messages", "count_users"))
+MessagesCount = namedtuple("MessagesCount", "rooms count")
+UsersCount = namedtuple("UsersCount", "name_room count")
+
+
+def make_rows(count: int):
+    now = datetime.now(timezone.utc)
+    owner = uuid.uuid4()
+    rooms = [Room(uuid.uuid4(), owner, f"room {i}", "https://example.com/room.webp", now,
+                  False, False, None, None) for i in range(count)]
+    messages_count = [MessagesCount(room.name_room, i * 3) for i, room in enumerate(rooms)]
+    users_count = [UsersCount(room.name_room, i % 50) for i, room in enumerate(rooms)]
+    card_rows = [CardRow(*room, i * 3, i % 50) for i, room in enumerate(rooms)]
+    favorites = {room.id: i % 10 == 0 for i, room in enumerate(rooms)}
+    return rooms, messages_count, users_count, card_rows, favorites
+
+
+def scan_path(rooms, messages_count, users_count, favorites):
+    """What the listings did before: two linear scans per room."""
+    rooms_info = []
+    for room in rooms:
+        rooms_info.append({
+            "id": room.id,
+            "owner": room.owner,
+            "name_room": room.name_room,
+            "image_room": room.image_room,
+            "count_users": next((uc.count for uc in users_count if uc.name_room == room.name_room), 0),
+            "count_messages": next((mc.count for mc in messages_count if mc.rooms == room.name_room), 0),
+            "created_at": room.created_at,
+            "secret_room": room.secret_room,
+            "block": room.block,
+            "description": room.description,
+            "delete_at": room.delete_at,
+            "favorite": favorites[room.id],
+        })
+    return sort_by_favorite(rooms_info)
+
+
+def card_path(card_rows, favorites):
+    """``get_favorite_room_cards`` after its query: cards keyed by id, flags joined by dict lookup."""
+    cards = {row.id: room_card(row) for row in card_rows}
+    return sort_by_favorite([dict(cards[room_id], favorite=bool(favorite))
+                             for room_id, favorite in favorites.items() if room_id in cards])
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rooms':>6}{'scan ms':>12}{'cards ms':>10}{'speedup':>10}")
+    for size in sorted({100, 1000, args.rooms}):
+        rooms, messages_count, users_count, card_rows, favorites = make_rows(size)
+        assert scan_path(rooms, messages_count, users_count, favorites) == card_path(card_rows, favorites)
+
+        scan = timed(lambda: scan_path(rooms, messages_count, users_count, favorites), args.repeat)
+        cards = timed(lambda: card_path(card_rows, favorites), args.repeat)
+        print(f"{size:>6}{scan * 1000:>12.2f}{cards * 1000:>10.2f}{scan / cards:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Room creation throughput: the old four-commit sequence vs. ``app.settings.room_lifecycle.create_room``.
+
+The old endpoint checked the name, waited for the image and then committed and refreshed
+the room, the owner's role, the "my rooms" entry and the secret-room entry one by one.
+``create_room`` writes them in one transaction, leaves the name check to the unique
+constraint and waits for the image while the room is flushed. The image is simulated with
+a sleep of ``--image-ms`` so the benchmark needs no storage account.
+
+Needs the configured database and at least one user (the owner of the rooms); the rooms
+are deleted again at the end. Run from the project root::
+
+    python -m benchmarks.room_creation --rooms 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy.future import select
+
+from app.config.start_schema import start_app
+from app.database.async_db import async_session_maker
+from app.models import room_model, user_model
+from app.schemas.room import RoomCreateV2
+from app.settings.get_info import get_room_name
+from app.settings.room_lifecycle import create_room, delete_rooms
+
+
+async def fake_image(delay: float) -> str:
+    await asyncio.sleep(delay)
+    return start_app.default_room_image
+
+
+async def sequential_create(owner, room_data: RoomCreateV2, delay: float, db) -> room_model.Rooms:
+    """What ``create_room_v2`` did before: a name check, then four commit + refresh round trips."""
+    if await get_room_name(room_data.name_room, db):
+        raise ValueError(f"Room {room_data.name_room} already exists")
+    image = await fake_image(delay)
+
+    room = room_model.Rooms(owner=owner.id, image_room=image, company_id=owner.company_id,
+                            **room_data.model_dump())
+    db.add(room)
+    await db.commit()
+    await db.refresh(room)
+    rows = [room_model.RoleInRoom(user_id=owner.id, room_id=room.id, role="owner"),
+            room_model.RoomsManagerMyRooms(user_id=owner.id, room_id=room.id)]
+    if room_data.secret_room:
+        rows.append(room_model.RoomsManagerSecret(user_id=owner.id, room_id=room.id))
+    for row in rows:
+        db.add(row)
+        await db.commit()
+        await db.refresh(row)
+    return room
+
+
+async def single_transaction_create(owner, room_data: RoomCreateV2, delay: float, db) -> room_model.Rooms:
+    return await create_room(owner, room_data, fake_image(delay), db)
+
+
+async def run(path, owner, rooms: int, concurrency: int, delay: float, label: str):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, created = [], []
+
+    async def one(i: int):
+        room_data = RoomCreateV2(name_room=f"bench {label} {uuid.uuid4().hex[:12]}", secret_room=i % 4 == 0)
+        async with semaphore, async_session_maker() as db:
+            start = time.perf_counter()
+            room = await path(owner, room_data, delay, db)
+            latencies.append(time.perf_counter() - start)
+            created.append(room.id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(rooms)))
+    elapsed = time.perf_counter() - start
+
+    async with async_session_maker() as db:
+        await delete_rooms(created, db)
+    return rooms / elapsed, statistics.median(latencies), max(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--image-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    async with async_session_maker() as db:
+        owner = (await db.execute(select(user_model.User).limit(1))).scalar_one()
+    delay = args.image_ms / 1000
+
+    print(f"{'path':<20}{'rooms/s':>10}{'p50 ms':>10}{'max ms':>10}")
+    for label, path in (("sequential", sequential_create), ("single transaction", single_transaction_create)):
+        throughput, p50, worst = await run(path, owner, args.rooms, args.concurrency, delay, label.split()[0])
+        print(f"{label:<20}{throughput:>10.1f}{p50 * 1000:>10.1f}{worst * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,31 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+from app.schemas.bulk import ListEncoder, json_response
+from app.schemas.message import ChatMessagesSchema, WrappedSocketMessage
+
+
+def make_row(i):
+    return {"message": {"created_at": datetime(2024, 1, 1, tzinfo=timezone.utc), "id": uuid.uuid4(),
+                        "message": f"m{i}", "vote": i, "edited": False, "deleted": False}}
+
+
+def test_list_encoder_matches_per_model_serialization():
+    rows = [make_row(i) for i in range(3)]
+    expected = [WrappedSocketMessage(message=ChatMessagesSchema(**row["message"])).model_dump(mode="json")
+                for row in rows]
+
+    encoder = ListEncoder(WrappedSocketMessage)
+
+    assert json.loads(encoder.dump_json(rows)) == expected
+    assert encoder.to_jsonable(rows) == expected
+
+
+def test_json_response_serves_cached_payload():
+    payload = ListEncoder(WrappedSocketMessage).to_jsonable([make_row(1)])
+
+    response = json_response(payload)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == payload
@@ -0,0 +1,93 @@
+import pytest
+
+from app.config import crypto_encrypto
+from app.config.crypto_encrypto import async_encrypt, async_decrypt, async_decrypt_many
+
+
+@pytest.fixture(autouse=True)
+def clear_plaintext_cache():
+    crypto_encrypto.plaintext_cache.clear()
+    yield
+    crypto_encrypto.plaintext_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_decrypt_many_keeps_input_order():
+    plaintexts = [f"message {i}" for i in range(37)]
+    encrypted = [await async_encrypt(text) for text in plaintexts]
+
+    assert await async_decrypt_many(encrypted) == plaintexts
+
+
+@pytest.mark.asyncio
+async def test_decrypt_many_matches_single_decrypt():
+    values = [await async_encrypt("hello"), "plain text", None, "bm90IGEgdG9rZW4="]
+
+    expected = [await async_decrypt(value) for value in values]
+
+    assert await async_decrypt_many(values) == expected
+
+
+@pytest.mark.asyncio
+async def test_decrypt_many_serves_repeats_from_cache():
+    encrypted = [await async_encrypt(f"hot {i}") for i in range(5)]
+    cache = crypto_encrypto.plaintext_cache
+
+    await async_decrypt_many(encrypted)
+    hits_before = cache.hits
+    await async_decrypt_many(encrypted)
+
+    assert cache.hits - hits_before == len(encrypted)
+
+
+@pytest.mark.asyncio
+async def test_decrypt_many_without_cache_leaves_it_empty():
+    encrypted = [await async_encrypt("export")]
+
+    assert await async_decrypt_many(encrypted, use_cache=False) == ["export"]
+    assert len(crypto_encrypto.plaintext_cache._data) == 0
+
+
+def test_plaintext_cache_is_bounded():
+    cache = crypto_encrypto.PlaintextCache(maxsize=2)
+    for value in ("a", "b", "c"):
+        cache.put(cache.digest(value), value)
+
+    assert cache.get(cache.digest("a")) is crypto_encrypto._MISSING
+    assert cache.get(cache.digest("c")) == "c"
+
+
+@pytest.mark.parametrize("version", [0, 1, 2])
+def test_envelope_round_trip(version):
+    stored = crypto_encrypto.encrypt("привіт, світ", version)
+
+    assert crypto_encrypto.decrypt(stored) == "привіт, світ"
+
+
+def test_envelope_prefixes():
+    assert crypto_encrypto.encrypt("x", 2).startswith(crypto_encrypto.AESGCM_PREFIX)
+    assert crypto_encrypto.encrypt("x", 1).startswith(crypto_encrypto.FERNET_PREFIX)
+    assert crypto_encrypto.encrypt("x", 0).startswith(crypto_encrypto.LEGACY_PREFIX)
+
+
+def test_envelope_reads_plaintext_and_empty_values_as_is():
+    assert crypto_encrypto.decrypt("just a message") == "just a message"
+    assert crypto_encrypto.decrypt("") == ""
+    assert crypto_encrypto.decrypt(None) is None
+
+
+@pytest.mark.parametrize("version", [0, 1, 2])
+def test_tampered_envelope_is_rejected(version):
+    stored = crypto_encrypto.encrypt("secret", version)
+    tampered = stored[:-6] + ("A" if stored[-6] != "A" else "B") + stored[-5:]
+
+    assert crypto_encrypto.decrypt(tampered) is None
+
+
+@pytest.mark.parametrize("value", ["v2: release notes", "v1: draft", "Z0FBQUFBhello"])
+def test_plaintext_with_envelope_prefix_is_returned_as_is(value):
+    assert crypto_encrypto.decrypt(value) == value
+
+
+def test_new_messages_default_to_legacy_envelope():
+    assert crypto_encrypto.encrypt("x").startswith(crypto_encrypto.LEGACY_PREFIX)
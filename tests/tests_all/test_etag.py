@@ -0,0 +1,33 @@
+from starlette.requests import Request
+
+from app.config.etag import etag_matches, make_etag, not_modified
+
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_etag_is_strong_and_depends_on_every_part():
+    etag = make_etag("messages", "room", 3, 50)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("messages", "room", 3, 50)
+    assert etag != make_etag("messages", "room", 4, 50)
+
+
+def test_if_none_match_handles_lists_weak_tags_and_wildcard():
+    etag = make_etag("rooms", 1)
+
+    assert etag_matches(make_request(f'"other", W/{etag}'), etag)
+    assert etag_matches(make_request("*"), etag)
+    assert not etag_matches(make_request('"other"'), etag)
+    assert not etag_matches(make_request(), etag)
+
+
+def test_not_modified_has_no_body_and_echoes_etag():
+    response = not_modified('"abc"')
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"abc"'
+    assert response.body == b""
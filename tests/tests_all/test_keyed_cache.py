@@ -0,0 +1,24 @@
+import pytest
+
+from app.cache.backends import InMemoryBackend, KeyedCache, cache_stats
+
+
+class ThingCache(KeyedCache):
+    prefix = "thing"
+
+
+@pytest.mark.asyncio
+async def test_keyed_cache_counts_lookups_and_invalidates():
+    cache = ThingCache(ttl=60, backend=InMemoryBackend(maxsize=10))
+    await cache.store(cache.key(1), {"stamp": "a"})
+
+    assert cache.key(1) == "thing:1"
+    assert await cache.lookup(cache.key(1)) == {"stamp": "a"}
+    assert await cache.lookup(cache.key(1), valid=lambda entry: entry["stamp"] == "b") is None
+    assert await cache.lookup(cache.key(2)) is None
+
+    await cache.invalidate(1)
+    await cache.invalidate(None)
+
+    assert await cache.lookup(cache.key(1)) is None
+    assert cache_stats(cache) == {"hits": 1, "misses": 3, "hit_rate": 0.25, "entries": 0}
@@ -0,0 +1,43 @@
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.settings.message_history import MESSAGE_PAGE_MAX, MESSAGE_PAGE_SIZE, HistoryLimit, reply_targets_query
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/history")
+    async def history(limit: HistoryLimit = MESSAGE_PAGE_SIZE):
+        return limit
+
+    return TestClient(app)
+
+
+def test_reply_targets_are_limited_to_the_room():
+    room_id = uuid.uuid4()
+
+    compiled = reply_targets_query(room_id, {uuid.uuid4()}).compile(dialect=postgresql.dialect())
+
+    assert "chat_messages.id IN" in str(compiled)
+    assert "chat_messages.room_id = " in str(compiled)
+    assert room_id in compiled.params.values()
+
+
+@pytest.mark.parametrize("limit", [0, -1, MESSAGE_PAGE_MAX + 1, 1000000])
+def test_history_limit_out_of_range_is_rejected(client, limit):
+    assert client.get("/history", params={"limit": limit}).status_code == 422
+
+
+@pytest.mark.parametrize("params, limit", [({}, MESSAGE_PAGE_SIZE), ({"limit": 1}, 1),
+                                           ({"limit": MESSAGE_PAGE_MAX}, MESSAGE_PAGE_MAX)])
+def test_history_limit_in_range_is_accepted(client, params, limit):
+    response = client.get("/history", params=params)
+
+    assert response.status_code == 200
+    assert response.json() == limit
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+os.environ.setdefault("PASSWORD_PEPPER", "test-pepper")
+
+from app.settings.passwords import PasswordService, hash_rounds  # noqa: E402
+
+
+@pytest.mark.asyncio
+async def test_verify_and_update_rehashes_when_cost_changes():
+    old = PasswordService(rounds=4, workers=2, queue_size=2)
+    hashed = await old.hash("secret")
+    assert hash_rounds(hashed) == 4
+    assert await old.verify("secret", hashed)
+    assert not await old.verify("wrong", hashed)
+    assert not await old.verify("secret", "not a hash")
+    assert await old.verify_and_update("secret", hashed) == (True, None)
+
+    new = PasswordService(rounds=5, workers=2, queue_size=2)
+    assert new.needs_rehash(hashed)
+    assert await new.verify_and_update("wrong", hashed) == (False, None)
+    valid, new_hash = await new.verify_and_update("secret", hashed)
+    assert valid and hash_rounds(new_hash) == 5
+    assert await new.verify("secret", new_hash)
+    assert new.stats()["rehashed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_pool_rejects_with_503():
+    service = PasswordService(rounds=4, workers=1, queue_size=1)
+    release = threading.Event()
+    running = [asyncio.ensure_future(service._run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert service.stats()["pending"] == 2 and service.stats()["queued"] == 1
+
+    with pytest.raises(HTTPException) as exc:
+        await service.hash("secret")
+    assert exc.value.status_code == 503
+
+    release.set()
+    await asyncio.gather(*running)
+    stats = service.stats()
+    assert stats["pending"] == 0 and stats["peak_pending"] == 2
+    assert stats["completed"] == 2 and stats["rejected"] == 1
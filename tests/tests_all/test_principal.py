@@ -0,0 +1,27 @@
+import dataclasses
+import uuid
+from collections import namedtuple
+
+import pytest
+
+from app.auth.principal import Principal
+
+UserRow = namedtuple("UserRow", "id company_id role blocked verified active")
+
+
+def test_principal_from_user_row_packs_status_flags():
+    row = UserRow(uuid.uuid4(), uuid.uuid4(), "admin", blocked=True, verified=True, active=False)
+
+    principal = Principal.from_user(row)
+
+    assert principal.id == row.id and principal.company_id == row.company_id
+    assert principal.role == "admin"
+    assert principal.blocked and principal.verified and not principal.active
+
+
+def test_principal_is_frozen_and_slotted():
+    principal = Principal(id=uuid.uuid4(), company_id=None, role="user", status=0)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        principal.role = "admin"
+    assert not hasattr(principal, "__dict__")
@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.settings.room_cards import decode_room_cursor, encode_room_cursor
+
+
+@pytest.mark.parametrize("sort, value", [
+    ("messages", 12),
+    ("members", 0),
+    ("name", "general"),
+    ("newest", datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)),
+])
+def test_room_cursor_round_trip(sort, value):
+    room_id = uuid.uuid4()
+
+    assert decode_room_cursor(encode_room_cursor(sort, value, room_id), sort) == (value, room_id)
+
+
+@pytest.mark.parametrize("sort, value", [
+    ("messages", "12"),
+    ("members", True),
+    ("name", 3),
+    ("activity", 1700000000),
+])
+def test_room_cursor_with_wrong_key_type_is_rejected(sort, value):
+    cursor = encode_room_cursor(sort, value, uuid.uuid4())
+
+    with pytest.raises(ValueError):
+        decode_room_cursor(cursor, sort)
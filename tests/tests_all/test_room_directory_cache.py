@@ -0,0 +1,93 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.cache.backends import InMemoryBackend
+from app.cache.room_directory import RoomDirectoryCache
+
+
+def make_cache(ttl=60):
+    return RoomDirectoryCache(ttl=ttl, stale=300, backend=InMemoryBackend(maxsize=8))
+
+
+def counting_loader(body=b"[]", delay=0.01):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return {"body": body + str(len(calls)).encode(), "next_cursor": None}
+
+    return loader, calls
+
+
+@pytest.mark.asyncio
+async def test_room_directory_builds_once_for_concurrent_misses():
+    cache = make_cache()
+    loader, calls = counting_loader()
+
+    entries = await asyncio.gather(*(cache.get(None, "messages", loader) for _ in range(10)))
+
+    assert len(calls) == 1
+    assert {entry["etag"] for entry in entries} == {entries[0]["etag"]}
+
+
+@pytest.mark.asyncio
+async def test_room_directory_serves_stale_entry_while_refreshing():
+    cache = make_cache(ttl=0)
+    loader, calls = counting_loader()
+
+    first = await cache.get(None, "messages", loader)
+    stale = await cache.get(None, "messages", loader)
+    await asyncio.sleep(0.05)
+    fresh = await cache.get(None, "messages", loader)
+
+    assert stale["body"] == first["body"]
+    assert fresh["body"] != first["body"]
+    assert len(calls) >= 2
+
+
+@pytest.mark.asyncio
+async def test_room_directory_invalidate_drops_every_variant_of_public_and_company_entries():
+    cache = make_cache()
+    company_id = uuid.uuid4()
+    loader, calls = counting_loader()
+
+    await cache.get(None, "messages", loader)
+    await cache.get(company_id, "messages", loader)
+    await cache.get(company_id, "name", loader)
+    await cache.invalidate(company_id)
+    await cache.get(None, "messages", loader)
+    await cache.get(company_id, "messages", loader)
+    await cache.get(company_id, "name", loader)
+
+    assert len(calls) == 6
+
+
+@pytest.mark.asyncio
+async def test_room_directory_build_racing_an_invalidation_is_not_stored():
+    cache = make_cache()
+    loader, calls = counting_loader(delay=0.05)
+
+    build = asyncio.create_task(cache.get(None, "messages", loader))
+    await asyncio.sleep(0.01)
+    await cache.invalidate()
+    await build
+
+    assert await cache.backend.get(cache.key(None, "messages")) is None
+
+
+@pytest.mark.asyncio
+async def test_room_directory_invalidation_reaches_workers_sharing_generations():
+    shared = InMemoryBackend(maxsize=8)
+    workers = [RoomDirectoryCache(ttl=60, stale=300, backend=InMemoryBackend(maxsize=8), shared=shared)
+               for _ in range(2)]
+    loader, calls = counting_loader()
+
+    for worker in workers:
+        await worker.get(None, "messages", loader)
+    await workers[0].invalidate()
+    await workers[1].get(None, "messages", loader)
+
+    assert len(calls) == 3
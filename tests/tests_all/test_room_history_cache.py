@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+
+from app.cache.backends import InMemoryBackend, cache_stats
+from app.cache.room_history import RoomHistoryCache
+
+
+def make_cache(shared=None):
+    return RoomHistoryCache(size=3, ttl=60, local=InMemoryBackend(maxsize=8), shared=shared)
+
+
+def rendered(n):
+    return [{"message": {"id": str(uuid.uuid4()), "message": f"m{i}"}} for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_history_cache_keeps_newest_messages_and_slices_pages():
+    cache = make_cache()
+    room_id = uuid.uuid4()
+    messages = rendered(5)
+
+    await cache.put(room_id, messages, 1)
+
+    assert await cache.get(room_id, 3, 1) == messages[:3]
+    assert await cache.get(room_id, 2, 1) == messages[:2]
+    assert cache.covers(3) and not cache.covers(4)
+
+
+@pytest.mark.asyncio
+async def test_history_cache_invalidate_drops_both_tiers():
+    shared = InMemoryBackend()
+    cache = make_cache(shared)
+    room_id = uuid.uuid4()
+
+    await cache.put(room_id, rendered(2), 1)
+    await cache.invalidate(room_id)
+
+    assert await cache.get(room_id, 2, 1) is None
+    assert await shared.get(cache.key(room_id)) is None
+
+
+@pytest.mark.asyncio
+async def test_history_cache_refills_local_tier_from_shared():
+    shared = InMemoryBackend()
+    room_id = uuid.uuid4()
+    messages = rendered(3)
+    await make_cache(shared).put(room_id, messages, 1)
+
+    other_worker = make_cache(shared)
+
+    assert await other_worker.get(room_id, 3, 1) == messages
+    assert await other_worker.local.get(other_worker.key(room_id)) is not None
+
+
+@pytest.mark.asyncio
+async def test_history_cache_misses_when_room_version_moved_on():
+    cache = make_cache()
+    room_id = uuid.uuid4()
+
+    await cache.put(room_id, rendered(2), 7)
+
+    assert await cache.get(room_id, 2, 8) is None
+    assert cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_history_cache_misses_when_user_cards_changed():
+    cache = make_cache()
+    room_id = uuid.uuid4()
+
+    await cache.put(room_id, rendered(2), 7, card_version=3)
+
+    assert await cache.get(room_id, 2, 7, card_version=3) is not None
+    assert await cache.get(room_id, 2, 7, card_version=4) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_reports_hit_rate_and_local_entries():
+    cache = make_cache()
+    room_id = uuid.uuid4()
+
+    await cache.put(room_id, rendered(2), 1)
+    await cache.get(room_id, 2, 1)
+    await cache.get(room_id, 2, 1)
+    await cache.get(uuid.uuid4(), 2, 1)
+
+    assert cache_stats(cache) == {"hits": 2, "misses": 1, "hit_rate": 0.6667, "entries": 1}
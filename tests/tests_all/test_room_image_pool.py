@@ -0,0 +1,65 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config.random_images import ImagePool
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    served = 0
+
+    def do_GET(self):
+        ImageHandler.served += 1
+        body = json.dumps({"url": f"http://images.test/{ImageHandler.served}.jpg"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def image_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/image"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_image_pool_fills_from_source_and_refills_in_background(image_server):
+    pool = ImagePool(image_server, size=6, fallbacks=["fallback.jpg"], concurrency=2)
+    await pool.fill()
+    assert len(pool.urls) == 6
+
+    taken = [pool.take() for _ in range(4)]
+    assert all(url.startswith("http://images.test/") for url in taken)
+    assert len(set(taken)) == 4
+
+    await pool._refill_task
+    assert len(pool.urls) == 6
+    assert pool.hits == 4 and pool.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_image_pool_falls_back_when_source_is_down(image_server):
+    pool = ImagePool(image_server.rsplit(":", 1)[0] + ":1/image", size=4, fallbacks=["fallback.jpg"], timeout=1)
+
+    assert pool.take() == "fallback.jpg"
+    await pool._refill_task
+    assert len(pool.urls) == 0
+    assert pool.misses == 1
+
+
+def test_image_pool_take_without_event_loop_uses_fallback():
+    pool = ImagePool("http://127.0.0.1:1/image", size=4, fallbacks=["fallback.jpg"])
+
+    assert pool.take() == "fallback.jpg"
+    assert pool._refill_task is None